@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+GitHub Spec Kit - Shared Helpers
+Utilities shared by the command scripts
+"""
+
+import functools
+import os
+import shutil
+import sys
+from pathlib import Path
+
+@functools.lru_cache(maxsize=4)
+def _spec_dir_names(specs_dir, mtime_ns):
+    """List feature directory names, newest first; cached per specs/ mtime"""
+    with os.scandir(specs_dir) as it:
+        names = [entry.name for entry in it if entry.is_dir(follow_symlinks=False)]
+    return tuple(sorted(names, reverse=True))
+
+@functools.lru_cache(maxsize=8)
+def _read_template(path, mtime_ns):
+    """Read a template file; cached per path and modification time"""
+    return Path(path).read_text(encoding="utf-8")
+
+def load_template(path):
+    """Return a template's text, re-reading it only when the file changes"""
+    return _read_template(path, os.stat(path).st_mtime_ns)
+
+def latest_spec_dir(require_plan=False, specs_dir="specs"):
+    """Return the latest feature directory, optionally only those with a plan.md"""
+    names = _spec_dir_names(specs_dir, os.stat(specs_dir).st_mtime_ns)
+    for name in names:
+        # plan.md lives one level down, so it is checked outside the cache
+        if not require_plan or os.path.exists(os.path.join(specs_dir, name, "plan.md")):
+            return Path(specs_dir) / name
+    return None
+
+def write_lines(lines):
+    """Write report lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def echo_file(path):
+    """Stream a file's raw bytes to stdout without decoding it into memory"""
+    sys.stdout.flush()
+    with open(path, "rb") as f:
+        shutil.copyfileobj(f, sys.stdout.buffer)
+    sys.stdout.buffer.write(b"\n")
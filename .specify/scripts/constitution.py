@@ -9,7 +9,9 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-def update_constitution(update_description=None):
+from _common import echo_file, write_lines
+
+def update_constitution(update_parts=None, quiet=False):
     """Update project constitution"""
     
     constitution_file = Path("memory/constitution.md")
@@ -18,31 +20,34 @@ def update_constitution(update_description=None):
         print("❌ Constitution file not found at memory/constitution.md")
         return None
     
-    # Read current constitution
-    with open(constitution_file, "r", encoding="utf-8") as f:
-        current_content = f.read()
-    
-    if update_description:
-        print(f"📝 Current constitution loaded from: {constitution_file}")
-        print(f"🎯 Update request: {update_description}")
-        print("\n📋 Current Constitution:")
-        print("=" * 50)
-        print(current_content)
-        print("=" * 50)
-        print(f"\n⚠️  Constitution updates require careful review and team approval.")
-        print(f"Please review the current constitution and propose specific changes.")
+    if update_parts:
+        lines = [
+            f"📝 Current constitution loaded from: {constitution_file}",
+            f"🎯 Update request: {' '.join(update_parts)}",
+        ]
     else:
-        print(f"📝 Constitution loaded from: {constitution_file}")
-        print("\n📋 Current Constitution:")
-        print("=" * 50)
-        print(current_content)
-        print("=" * 50)
+        lines = [f"📝 Constitution loaded from: {constitution_file}"]
+    
+    # Stream the constitution straight from the file (skipped with --quiet)
+    if not quiet:
+        write_lines(lines + ["\n📋 Current Constitution:", "=" * 50])
+        echo_file(constitution_file)
+        lines = ["=" * 50]
+    
+    if update_parts:
+        lines += [
+            f"\n⚠️  Constitution updates require careful review and team approval.",
+            f"Please review the current constitution and propose specific changes.",
+        ]
+    
+    write_lines(lines)
     
     return str(constitution_file)
 
 def main():
-    update_request = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else None
-    return update_constitution(update_request)
+    args = [arg for arg in sys.argv[1:] if arg not in ("-q", "--quiet")]
+    quiet = len(args) != len(sys.argv) - 1
+    return update_constitution(args, quiet=quiet)
 
 if __name__ == "__main__":
     main()
@@ -8,73 +8,105 @@ import os
 import sys
 from pathlib import Path
 
-def check_installation():
-    """Verify Spec Kit installation and configuration"""
-    
-    print("🔍 GitHub Spec Kit - Health Check")
-    print("=" * 50)
+from _common import write_lines
+
+# (label, parent directory, entry name)
+_STRUCTURE_CHECKS = (
+    ("📁 .specify directory", ".", ".specify"),
+    ("📁 scripts directory", ".specify", "scripts"),
+    ("📁 specs directory", ".", "specs"),
+    ("📁 templates directory", ".", "templates"),
+    ("📁 memory directory", ".", "memory"),
+    ("📄 CLAUDE.md", ".", "CLAUDE.md"),
+    ("📄 constitution.md", "memory", "constitution.md"),
+)
+
+_SCRIPTS = (
+    "specify.py",
+    "plan.py",
+    "tasks.py",
+    "constitution.py",
+    "implement.py",
+    "_common.py",
+)
+
+_TEMPLATES = (
+    "spec-template.md",
+    "plan-template.md",
+    "tasks-template.md",
+)
+
+def _dir_contents(path):
+    """Return the set of entry names in a directory (empty if missing)"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+def _iter_checks():
+    """Yield (name, status) pairs, listing each directory only when reached"""
     
     # Check project structure
-    checks = [
-        ("📁 .specify directory", Path(".specify").exists()),
-        ("📁 scripts directory", Path(".specify/scripts").exists()),
-        ("📁 specs directory", Path("specs").exists()),  
-        ("📁 templates directory", Path("templates").exists()),
-        ("📁 memory directory", Path("memory").exists()),
-        ("📄 CLAUDE.md", Path("CLAUDE.md").exists()),
-        ("📄 constitution.md", Path("memory/constitution.md").exists()),
-    ]
+    listings = {}
+    for label, parent, name in _STRUCTURE_CHECKS:
+        if parent not in listings:
+            listings[parent] = _dir_contents(parent)
+        yield (label, name in listings[parent])
     
     # Check scripts
-    scripts = [
-        "specify.py",
-        "plan.py", 
-        "tasks.py",
-        "constitution.py",
-        "implement.py"
-    ]
-    
-    for script in scripts:
-        script_path = Path(f".specify/scripts/{script}")
-        checks.append((f"🐍 {script}", script_path.exists()))
+    script_files = _dir_contents(".specify/scripts")
+    for script in _SCRIPTS:
+        yield (f"🐍 {script}", script in script_files)
     
     # Check templates
-    templates = [
-        "spec-template.md",
-        "plan-template.md",
-        "tasks-template.md"
+    template_files = _dir_contents("templates")
+    for template in _TEMPLATES:
+        yield (f"📝 {template}", template in template_files)
+
+def check_installation(verbose=True):
+    """Verify Spec Kit installation and configuration"""
+    
+    if not verbose:
+        # Pass/fail only: stop at the first failing check
+        return all(status for _, status in _iter_checks())
+    
+    lines = [
+        "🔍 GitHub Spec Kit - Health Check",
+        "=" * 50,
     ]
     
-    for template in templates:
-        template_path = Path(f"templates/{template}")
-        checks.append((f"📝 {template}", template_path.exists()))
+    checks = _iter_checks()
     
     # Display results
     all_good = True
     for name, status in checks:
         icon = "✅" if status else "❌"
-        print(f"{icon} {name}")
+        lines.append(f"{icon} {name}")
         if not status:
             all_good = False
     
-    print("=" * 50)
+    lines.append("=" * 50)
     
     if all_good:
-        print("🎉 All checks passed! GitHub Spec Kit is ready.")
-        print("\n🚀 Quick Start:")
-        print("   specify 'Your feature description here'")
-        print("   plan 'Your technical approach here'")  
-        print("   tasks")
-        print("   implement specs/001-*/plan.md")
-        
-        print("\n💡 See SPEC_KIT_README.md for detailed usage guide")
-        return True
+        lines += [
+            "🎉 All checks passed! GitHub Spec Kit is ready.",
+            "\n🚀 Quick Start:",
+            "   specify 'Your feature description here'",
+            "   plan 'Your technical approach here'",
+            "   tasks",
+            "   implement specs/001-*/plan.md",
+            "\n💡 See SPEC_KIT_README.md for detailed usage guide",
+        ]
     else:
-        print("❌ Some components are missing. Please check the installation.")
-        return False
+        lines.append("❌ Some components are missing. Please check the installation.")
+    
+    write_lines(lines)
+    return all_good
 
 def main():
-    return check_installation()
+    verbose = not ("-q" in sys.argv[1:] or "--quiet" in sys.argv[1:])
+    return check_installation(verbose)
 
 if __name__ == "__main__":
     success = main()
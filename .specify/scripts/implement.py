@@ -9,7 +9,9 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-def implement_plan(plan_path):
+from _common import echo_file, write_lines
+
+def implement_plan(plan_path, quiet=False):
     """Execute implementation plan"""
     
     plan_file = Path(plan_path)
@@ -19,53 +21,55 @@ def implement_plan(plan_path):
     
     feature_dir = plan_file.parent
     
-    # Read plan content
-    with open(plan_file, "r", encoding="utf-8") as f:
-        plan_content = f.read()
+    lines = [
+        f"🚀 Starting implementation of: {feature_dir.name}",
+        f"📋 Plan file: {plan_file}",
+    ]
     
-    print(f"🚀 Starting implementation of: {feature_dir.name}")
-    print(f"📋 Plan file: {plan_file}")
-    print("\n" + "=" * 60)
-    print("IMPLEMENTATION PLAN")
-    print("=" * 60)
-    print(plan_content)
-    print("=" * 60)
+    # Stream plan content straight from the file (skipped with --quiet)
+    if not quiet:
+        write_lines(lines + ["\n" + "=" * 60, "IMPLEMENTATION PLAN", "=" * 60])
+        echo_file(plan_file)
+        lines = ["=" * 60]
     
     # Check for tasks file
     tasks_file = feature_dir / "tasks.md"
     if tasks_file.exists():
-        print(f"\n📝 Task breakdown available: {tasks_file}")
-        with open(tasks_file, "r", encoding="utf-8") as f:
-            tasks_content = f.read()
-        print("\n" + "=" * 60)
-        print("TASK BREAKDOWN")
-        print("=" * 60)
-        print(tasks_content)
-        print("=" * 60)
+        lines.append(f"\n📝 Task breakdown available: {tasks_file}")
+        if not quiet:
+            write_lines(lines + ["\n" + "=" * 60, "TASK BREAKDOWN", "=" * 60])
+            echo_file(tasks_file)
+            lines = ["=" * 60]
     else:
-        print(f"\n⚠️  No task breakdown found. Run `/tasks` first for detailed task list.")
+        lines.append(f"\n⚠️  No task breakdown found. Run `/tasks` first for detailed task list.")
+    
+    lines += [
+        f"\n🎯 Ready for implementation!",
+        f"📁 Working directory: {feature_dir}",
+        f"\n✅ TDD Approach:",
+        f"   1. Write tests first (RED)",
+        f"   2. Implement minimal code to pass (GREEN)",
+        f"   3. Refactor and optimize (REFACTOR)",
+        f"\n🔧 Constitution compliance:",
+        f"   - Follow security-first principles",
+        f"   - Ensure cross-platform compatibility",
+        f"   - Maintain <2s response times",
+        f"   - Document all API endpoints",
+    ]
     
-    print(f"\n🎯 Ready for implementation!")
-    print(f"📁 Working directory: {feature_dir}")
-    print(f"\n✅ TDD Approach:")
-    print(f"   1. Write tests first (RED)")
-    print(f"   2. Implement minimal code to pass (GREEN)")
-    print(f"   3. Refactor and optimize (REFACTOR)")
-    print(f"\n🔧 Constitution compliance:")
-    print(f"   - Follow security-first principles")
-    print(f"   - Ensure cross-platform compatibility")
-    print(f"   - Maintain <2s response times")
-    print(f"   - Document all API endpoints")
+    write_lines(lines)
     
     return str(plan_file)
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python implement.py path/to/plan.md")
+    args = [arg for arg in sys.argv[1:] if arg not in ("-q", "--quiet")]
+    if not args:
+        print("Usage: python implement.py path/to/plan.md [--quiet]")
         sys.exit(1)
     
-    plan_path = sys.argv[1]
-    return implement_plan(plan_path)
+    quiet = len(args) != len(sys.argv) - 1
+    plan_path = args[0]
+    return implement_plan(plan_path, quiet=quiet)
 
 if __name__ == "__main__":
     main()
@@ -11,8 +11,12 @@ from datetime import datetime
 from pathlib import Path
 import re
 
-def create_implementation_plan(tech_description, spec_path=None):
-    """Create technical implementation plan"""
+from _common import latest_spec_dir, load_template
+
+_PLACEHOLDER_RE = re.compile(r'\[FEATURE NAME\]|\[FEATURE-BRANCH\]|\[DATE\]|\$ARGUMENTS')
+
+def create_implementation_plan(tech_description_parts, spec_path=None, today=None):
+    """Create technical implementation plan from the description words"""
     
     if spec_path:
         # Use existing spec directory
@@ -24,25 +28,27 @@ def create_implementation_plan(tech_description, spec_path=None):
             print("❌ No specs directory found. Run `/specify` first.")
             return None
             
-        spec_dirs = [d for d in specs_dir.iterdir() if d.is_dir()]
-        if not spec_dirs:
+        feature_dir = latest_spec_dir(require_plan=False)
+        if feature_dir is None:
             print("❌ No feature specs found. Run `/specify` first.")
             return None
-            
-        feature_dir = max(spec_dirs, key=lambda x: x.name)
     
     # Load plan template
-    with open("templates/plan-template.md", "r", encoding="utf-8") as f:
-        template = f.read()
+    template_path = "templates/plan-template.md"
+    template = load_template(template_path)
     
     # Get feature info
     feature_name = feature_dir.name
+    today = today or datetime.now().strftime("%Y-%m-%d")
     
-    # Replace template variables
-    plan_content = template.replace("[FEATURE NAME]", feature_name.replace("-", " ").title())
-    plan_content = plan_content.replace("[FEATURE-BRANCH]", feature_name)
-    plan_content = plan_content.replace("[DATE]", datetime.now().strftime("%Y-%m-%d"))
-    plan_content = plan_content.replace("$ARGUMENTS", tech_description)
+    # Replace template variables in a single pass
+    subs = {
+        "[FEATURE NAME]": feature_name.replace("-", " ").title(),
+        "[FEATURE-BRANCH]": feature_name,
+        "[DATE]": today,
+        "$ARGUMENTS": " ".join(tech_description_parts),
+    }
+    plan_content = _PLACEHOLDER_RE.sub(lambda m: subs[m.group(0)], template)
     
     # Write plan file
     plan_file = feature_dir / "plan.md"
@@ -63,8 +69,8 @@ def main():
         print("Usage: python plan.py 'Technical implementation description'")
         sys.exit(1)
     
-    tech_description = " ".join(sys.argv[1:])
-    return create_implementation_plan(tech_description)
+    today = datetime.now().strftime("%Y-%m-%d")
+    return create_implementation_plan(sys.argv[1:], today=today)
 
 if __name__ == "__main__":
     main()
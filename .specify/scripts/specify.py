@@ -11,31 +11,46 @@ import re
 from datetime import datetime
 from pathlib import Path
 
-def create_feature_spec(description):
-    """Create a new feature specification"""
+from _common import load_template
+
+_PLACEHOLDER_RE = re.compile(r'\[FEATURE NAME\]|\[###-feature-name\]|\[DATE\]|\$ARGUMENTS')
+_NON_WORD_RE = re.compile(r'[^\w\s-]')
+_SPACE_RE = re.compile(r'[-\s]+')
+_SPEC_PREFIX_RE = re.compile(r'^\d{3}-')
+
+def create_feature_spec(description_parts, today=None):
+    """Create a new feature specification from the description words"""
+    
+    description = " ".join(description_parts)
     
     # Generate feature number and name
     specs_dir = Path("specs")
-    existing_specs = [d for d in specs_dir.iterdir() if d.is_dir() and d.name.startswith(("001", "002", "003", "004", "005", "006", "007", "008", "009"))]
-    next_number = f"{len(existing_specs) + 1:03d}"
+    with os.scandir(specs_dir) as it:
+        existing_specs = sum(1 for entry in it if entry.is_dir(follow_symlinks=False) and _SPEC_PREFIX_RE.match(entry.name))
+    next_number = f"{existing_specs + 1:03d}"
     
     # Create feature name from description
-    feature_name = re.sub(r'[^\w\s-]', '', description.lower())
-    feature_name = re.sub(r'[-\s]+', '-', feature_name)[:50]
-    feature_dir = specs_dir / f"{next_number}-{feature_name}"
+    feature_name = _NON_WORD_RE.sub('', description.lower())
+    feature_name = _SPACE_RE.sub('-', feature_name)[:50]
+    feature_slug = f"{next_number}-{feature_name}"
+    feature_dir = specs_dir / feature_slug
     
     # Create feature directory
     feature_dir.mkdir(parents=True, exist_ok=True)
     
     # Load spec template
-    with open("templates/spec-template.md", "r", encoding="utf-8") as f:
-        template = f.read()
+    template_path = "templates/spec-template.md"
+    template = load_template(template_path)
     
-    # Replace template variables
-    spec_content = template.replace("[FEATURE NAME]", description.title())
-    spec_content = spec_content.replace("[###-feature-name]", f"{next_number}-{feature_name}")
-    spec_content = spec_content.replace("[DATE]", datetime.now().strftime("%Y-%m-%d"))
-    spec_content = spec_content.replace("$ARGUMENTS", description)
+    # Replace template variables in a single pass
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    subs = {
+        "[FEATURE NAME]": description.title(),
+        "[###-feature-name]": feature_slug,
+        "[DATE]": today,
+        "$ARGUMENTS": description,
+    }
+    spec_content = _PLACEHOLDER_RE.sub(lambda m: subs[m.group(0)], template)
     
     # Write spec file
     spec_file = feature_dir / "spec.md"
@@ -56,8 +71,8 @@ def main():
         print("Usage: python specify.py 'Feature description'")
         sys.exit(1)
     
-    description = " ".join(sys.argv[1:])
-    return create_feature_spec(description)
+    today = datetime.now().strftime("%Y-%m-%d")
+    return create_feature_spec(sys.argv[1:], today=today)
 
 if __name__ == "__main__":
     main()
@@ -5,11 +5,16 @@ Generates executable task breakdown from implementation plans
 """
 
 import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
-def create_task_breakdown(feature_dir=None):
+from _common import latest_spec_dir, load_template
+
+_PLACEHOLDER_RE = re.compile(r'\[FEATURE NAME\]|\[FEATURE-BRANCH\]|\[DATE\]')
+
+def create_task_breakdown(feature_dir=None, today=None):
     """Create task breakdown from existing plan"""
     
     if feature_dir:
@@ -21,30 +26,31 @@ def create_task_breakdown(feature_dir=None):
             print("❌ No specs directory found. Run `/specify` and `/plan` first.")
             return None
             
-        spec_dirs = [d for d in specs_dir.iterdir() if d.is_dir() and (d / "plan.md").exists()]
-        if not spec_dirs:
+        feature_dir = latest_spec_dir(require_plan=True)
+        if feature_dir is None:
             print("❌ No implementation plans found. Run `/plan` first.")
             return None
-            
-        feature_dir = max(spec_dirs, key=lambda x: x.name)
     
     # Check if plan exists
-    plan_file = feature_dir / "plan.md"
-    if not plan_file.exists():
+    if not os.path.exists(os.path.join(feature_dir, "plan.md")):
         print(f"❌ No plan.md found in {feature_dir}. Run `/plan` first.")
         return None
     
     # Load tasks template
-    with open("templates/tasks-template.md", "r", encoding="utf-8") as f:
-        template = f.read()
+    template_path = "templates/tasks-template.md"
+    template = load_template(template_path)
     
     # Get feature info
     feature_name = feature_dir.name
+    today = today or datetime.now().strftime("%Y-%m-%d")
     
-    # Replace template variables
-    tasks_content = template.replace("[FEATURE NAME]", feature_name.replace("-", " ").title())
-    tasks_content = tasks_content.replace("[FEATURE-BRANCH]", feature_name)
-    tasks_content = tasks_content.replace("[DATE]", datetime.now().strftime("%Y-%m-%d"))
+    # Replace template variables in a single pass
+    subs = {
+        "[FEATURE NAME]": feature_name.replace("-", " ").title(),
+        "[FEATURE-BRANCH]": feature_name,
+        "[DATE]": today,
+    }
+    tasks_content = _PLACEHOLDER_RE.sub(lambda m: subs[m.group(0)], template)
     
     # Write tasks file
     tasks_file = feature_dir / "tasks.md"
@@ -61,8 +67,9 @@ def create_task_breakdown(feature_dir=None):
     return str(tasks_file)
 
 def main():
+    today = datetime.now().strftime("%Y-%m-%d")
     feature_path = sys.argv[1] if len(sys.argv) > 1 else None
-    return create_task_breakdown(feature_path)
+    return create_task_breakdown(feature_path, today=today)
 
 if __name__ == "__main__":
     main()
@@ -4,16 +4,26 @@ import sqlite3
 import os
 from datetime import datetime
 
+from fts_schema import FTS_STATEMENTS
+
 print("🚀 Executando migração para tabela unificada...")
 print("=" * 50)
 
 # Path para o banco de dados
 db_path = os.path.join(os.path.dirname(__file__), '..', 'kb-assistant.db')
 
-# Conectar ao banco
-conn = sqlite3.connect(db_path)
+# Conectar ao banco (transação controlada manualmente: toda a migração em um único commit)
+conn = sqlite3.connect(db_path, isolation_level=None)
+closed = False
 cursor = conn.cursor()
 
+# PRAGMAs para a carga em massa: WAL com fsync só no checkpoint, cache de 64 MB e mmap de 256 MB
+conn.execute("PRAGMA journal_mode=WAL")
+conn.execute("PRAGMA synchronous=NORMAL")
+conn.execute("PRAGMA mmap_size=268435456")
+conn.execute("PRAGMA cache_size=-65536")
+conn.execute("PRAGMA temp_store=MEMORY")
+
 try:
     # Verificar tabelas existentes
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -35,21 +45,27 @@ try:
             print("   - Tabela vazia")
 
         print("\n⚠️  Migração já foi executada anteriormente.")
+
+        cursor.execute("BEGIN IMMEDIATE")
     else:
         print("\n🔧 Iniciando migração...")
 
+        # executescript faz COMMIT do que estiver pendente, então a transação
+        # única da migração é aberta pelo próprio script
+        migration_script = ["BEGIN IMMEDIATE;"]
+
         # Backup das tabelas originais
         if 'kb_entries' in existing_tables:
             print("   - Fazendo backup de kb_entries...")
-            cursor.execute("ALTER TABLE kb_entries RENAME TO kb_entries_backup")
+            migration_script.append("ALTER TABLE kb_entries RENAME TO kb_entries_backup;")
 
         if 'incidents' in existing_tables:
             print("   - Fazendo backup de incidents...")
-            cursor.execute("ALTER TABLE incidents RENAME TO incidents_backup")
+            migration_script.append("ALTER TABLE incidents RENAME TO incidents_backup;")
 
-        # Criar nova tabela unificada
-        print("   - Criando tabela unificada 'entries'...")
-        cursor.execute("""
+        # Criar nova tabela unificada, índices e views de compatibilidade no mesmo script
+        print("   - Criando tabela unificada 'entries', índices e views de compatibilidade...")
+        migration_script.append("""
         CREATE TABLE entries (
             id TEXT PRIMARY KEY,
             entry_type TEXT NOT NULL CHECK(entry_type IN ('knowledge', 'incident')),
@@ -79,29 +95,40 @@ try:
             verified BOOLEAN DEFAULT 0,
             ai_suggested BOOLEAN DEFAULT 0,
             ai_confidence_score REAL,
-            metadata TEXT,
-            is_knowledge_base INTEGER GENERATED ALWAYS AS (CASE WHEN entry_type = 'knowledge' THEN 1 ELSE 0 END) STORED,
-            is_incident INTEGER GENERATED ALWAYS AS (CASE WHEN entry_type = 'incident' THEN 1 ELSE 0 END) STORED
-        )
-        """)
+            metadata TEXT
+        );
+
+        CREATE INDEX idx_entries_type ON entries(entry_type);
+        CREATE INDEX idx_entries_kb ON entries(id) WHERE entry_type = 'knowledge';
+        CREATE INDEX idx_entries_inc ON entries(id) WHERE entry_type = 'incident';
+        CREATE INDEX idx_entries_category ON entries(category);
+        CREATE INDEX idx_entries_status ON entries(status) WHERE status IS NOT NULL;
+        CREATE INDEX idx_entries_priority ON entries(priority) WHERE priority IS NOT NULL;
+        CREATE INDEX idx_entries_assigned ON entries(assigned_to) WHERE assigned_to IS NOT NULL;
+        CREATE INDEX idx_entries_created ON entries(created_at DESC, id);
+        CREATE INDEX idx_entries_updated ON entries(updated_at);
 
-        # Criar índices
-        print("   - Criando índices...")
-        indices = [
-            "CREATE INDEX idx_entries_type ON entries(entry_type)",
-            "CREATE INDEX idx_entries_category ON entries(category)",
-            "CREATE INDEX idx_entries_status ON entries(status) WHERE status IS NOT NULL",
-            "CREATE INDEX idx_entries_priority ON entries(priority) WHERE priority IS NOT NULL",
-            "CREATE INDEX idx_entries_assigned ON entries(assigned_to) WHERE assigned_to IS NOT NULL",
-            "CREATE INDEX idx_entries_created ON entries(created_at)",
-            "CREATE INDEX idx_entries_updated ON entries(updated_at)"
-        ]
-
-        for idx in indices:
-            cursor.execute(idx)
+        CREATE VIEW IF NOT EXISTS kb_entries AS
+        SELECT
+            id, title, description as problem, solution, category, tags,
+            created_at, updated_at, created_by, severity,
+            usage_count, success_count, failure_count, version
+        FROM entries
+        WHERE entry_type = 'knowledge';
+
+        CREATE VIEW IF NOT EXISTS incidents AS
+        SELECT
+            id, title, description, solution as resolution, category, tags,
+            created_at, updated_at, created_by, severity,
+            status, priority, assigned_to, resolved_by,
+            resolution_time_minutes as resolution_time, sla_deadline, reporter
+        FROM entries
+        WHERE entry_type = 'incident';
+        """)
+        cursor.executescript("\n".join(migration_script))
 
         # Migrar dados de kb_entries_backup
-        if 'kb_entries_backup' in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()[0]:
+        if 'kb_entries' in existing_tables or 'kb_entries_backup' in existing_tables:
             print("   - Migrando dados de kb_entries...")
             cursor.execute("""
             INSERT OR IGNORE INTO entries (
@@ -119,7 +146,7 @@ try:
             print(f"     ✓ {kb_count} registros de knowledge base migrados")
 
         # Migrar dados de incidents_backup
-        if 'incidents_backup' in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()[0]:
+        if 'incidents' in existing_tables or 'incidents_backup' in existing_tables:
             print("   - Migrando dados de incidents...")
             cursor.execute("""
             INSERT OR IGNORE INTO entries (
@@ -138,30 +165,6 @@ try:
             inc_count = cursor.rowcount
             print(f"     ✓ {inc_count} registros de incidentes migrados")
 
-        # Criar views de compatibilidade
-        print("   - Criando views de compatibilidade...")
-
-        cursor.execute("""
-        CREATE VIEW IF NOT EXISTS kb_entries AS
-        SELECT
-            id, title, description as problem, solution, category, tags,
-            created_at, updated_at, created_by, severity,
-            usage_count, success_count, failure_count, version
-        FROM entries
-        WHERE entry_type = 'knowledge'
-        """)
-
-        cursor.execute("""
-        CREATE VIEW IF NOT EXISTS incidents AS
-        SELECT
-            id, title, description, solution as resolution, category, tags,
-            created_at, updated_at, created_by, severity,
-            status, priority, assigned_to, resolved_by,
-            resolution_time_minutes as resolution_time, sla_deadline, reporter
-        FROM entries
-        WHERE entry_type = 'incident'
-        """)
-
         print("\n✅ Migração concluída com sucesso!")
 
         # Verificar resultados
@@ -175,6 +178,12 @@ try:
             total += row[0]
         print(f"   - TOTAL: {total} registros")
 
+    # Busca textual: índice FTS5 no lugar de LIKE sobre várias colunas
+    if 'entries_fts' not in existing_tables:
+        print("\n🔎 Criando índice de busca textual (FTS5)...")
+        for statement in FTS_STATEMENTS:
+            cursor.execute(statement)
+
     # Limpar tabelas antigas desnecessárias
     print("\n🧹 Limpando tabelas desnecessárias...")
 
@@ -191,17 +200,41 @@ try:
             print(f"   - Removida tabela: {table}")
 
     # Commit das mudanças
-    conn.commit()
+    cursor.execute("COMMIT")
+
+    # Voltar ao journal padrão (faz checkpoint e remove o WAL) antes do VACUUM
+    journal_mode = conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0]
 
     # VACUUM para otimizar o banco
     print("\n🔧 Otimizando banco de dados...")
-    conn.execute("VACUUM")
+    if journal_mode.lower() == 'delete':
+        # VACUUM INTO grava uma cópia compactada em uma única passada sequencial,
+        # que substitui o banco original de forma atômica
+        compact_path = db_path + '.compact'
+        if os.path.exists(compact_path):
+            os.remove(compact_path)
+        # Trava exclusiva mantida até depois da troca do arquivo: em modo EXCLUSIVE o
+        # lock obtido por uma escrita só é liberado ao fechar a conexão, impedindo que
+        # outro processo escreva no inode antigo enquanto a cópia é gerada
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        conn.execute("BEGIN EXCLUSIVE")
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.execute(f"PRAGMA user_version = {user_version}")
+        conn.execute("COMMIT")
+        conn.execute("VACUUM INTO ?", (compact_path,))
+        os.replace(compact_path, db_path)
+        conn.close()
+        closed = True
+    else:
+        # WAL ainda ativo (outra conexão aberta): substituir o arquivo perderia dados
+        conn.execute("VACUUM")
 
     print("\n✨ Processo completo! Banco de dados unificado e otimizado.")
 
 except Exception as e:
     print(f"\n❌ Erro durante a migração: {e}")
-    conn.rollback()
+    if not closed and conn.in_transaction:
+        conn.rollback()
 
 finally:
     # Fechar conexão
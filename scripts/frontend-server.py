@@ -4,14 +4,54 @@ Simple Frontend Server for Accenture Mainframe AI Assistant
 Serves the integrated HTML application with proper CORS headers
 """
 
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import os
+import signal
+import socket
 from pathlib import Path
 
+class FrontendServer(ThreadingHTTPServer):
+    """Servidor com uma thread por requisição e porta compartilhável entre processos"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def server_bind(self):
+        # SO_REUSEPORT permite que vários workers façam bind na mesma porta
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
 class FrontendHandler(SimpleHTTPRequestHandler):
+    # Buffer de escrita: status + headers saem em um único write
+    wbufsize = 1 << 16
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(Path(__file__).parent.parent), **kwargs)
 
+    def setup(self):
+        super().setup()
+        # Desabilita Nagle para respostas pequenas
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def copyfile(self, source, outputfile):
+        # Arquivos em disco vão direto do page cache para o socket (sendfile);
+        # listagens de diretório (BytesIO) seguem pelo caminho padrão
+        try:
+            source.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+
+        # TCP_CORK junta headers e início do corpo no mesmo segmento
+        cork = getattr(socket, 'TCP_CORK', None)
+        if cork is not None:
+            self.connection.setsockopt(socket.IPPROTO_TCP, cork, 1)
+        try:
+            outputfile.flush()
+            self.connection.sendfile(source)
+        finally:
+            if cork is not None:
+                self.connection.setsockopt(socket.IPPROTO_TCP, cork, 0)
+
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
@@ -27,7 +67,26 @@ class FrontendHandler(SimpleHTTPRequestHandler):
 def run_frontend_server():
     PORT = 8080
     server_address = ('', PORT)
-    httpd = HTTPServer(server_address, FrontendHandler)
+    httpd = FrontendServer(server_address, FrontendHandler)
+
+    # Workers extras (FRONTEND_WORKERS) compartilham a fila de accept do socket já criado
+    workers = int(os.environ.get('FRONTEND_WORKERS', '1'))
+    children = []
+    if hasattr(os, 'fork'):
+        for _ in range(workers - 1):
+            pid = os.fork()
+            if pid == 0:
+                children = None
+                break
+            children.append(pid)
+
+    if children is None:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os._exit(0)
 
     print("🚀 ===============================================")
     print("🚀 FRONTEND SERVER RUNNING")
@@ -35,6 +94,7 @@ def run_frontend_server():
     print(f"🚀 Port: {PORT}")
     print(f"🚀 Access: http://localhost:{PORT}")
     print(f"🚀 Backend: http://localhost:3001")
+    print(f"🚀 Workers: {len(children) + 1}")
     print("🚀 ===============================================")
     print()
 
@@ -42,6 +102,12 @@ def run_frontend_server():
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n⏹️ Frontend server stopped")
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
 
 if __name__ == '__main__':
     run_frontend_server()
\ No newline at end of file
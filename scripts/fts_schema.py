@@ -0,0 +1,33 @@
+"""Esquema do índice FTS5 de entries, compartilhado pela migração e pelo standalone.py"""
+
+# Índice FTS5 da busca textual: external content sobre entries (sem duplicar o texto),
+# sincronizado por triggers e populado a partir dos dados já existentes
+FTS_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+        title, description, category, solution,
+        content='entries', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_ai AFTER INSERT ON entries BEGIN
+        INSERT INTO entries_fts(rowid, title, description, category, solution)
+        VALUES (new.rowid, new.title, new.description, new.category, new.solution);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_ad AFTER DELETE ON entries BEGIN
+        INSERT INTO entries_fts(entries_fts, rowid, title, description, category, solution)
+        VALUES ('delete', old.rowid, old.title, old.description, old.category, old.solution);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_fts_au AFTER UPDATE ON entries BEGIN
+        INSERT INTO entries_fts(entries_fts, rowid, title, description, category, solution)
+        VALUES ('delete', old.rowid, old.title, old.description, old.category, old.solution);
+        INSERT INTO entries_fts(rowid, title, description, category, solution)
+        VALUES (new.rowid, new.title, new.description, new.category, new.solution);
+    END
+    """,
+    "INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')",
+]
@@ -4,10 +4,28 @@ Mock API Server for Next.js Application
 Serves the same endpoints as the original Express server with mock data
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
+import os
+import sys
+import threading
+import time
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timezone
+
+# orjson serializa direto para bytes e bem mais rápido; json da stdlib como fallback
+try:
+    import orjson
+
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+    _loads = json.loads
 
 # Mock data
 MOCK_INCIDENTS = [
@@ -82,54 +100,94 @@ MOCK_INCIDENTS = [
     }
 ]
 
+def _search_text(incident):
+    """Título e descrição em minúsculas, separados por NUL para não casar na junção"""
+    return f"{incident['title'] or ''}\0{incident['description'] or ''}".lower()
+
+# Texto de busca pré-calculado, paralelo a MOCK_INCIDENTS
+_SEARCH_INDEX = [_search_text(incident) for incident in MOCK_INCIDENTS]
+
+# Resposta do health check já serializada; só o timestamp muda por requisição
+_HEALTH_TEMPLATE = (
+    b'{"success":true,"status":"healthy","timestamp":"%s",'
+    b'"database":"connected (mock)","architecture":"Python Mock API"}'
+)
+
+# Log de acesso: MOCK_API_LOG=0 desativa (benchmarks); em terminal, flush por linha
+_LOG_ENABLED = os.environ.get('MOCK_API_LOG', '1') != '0'
+_LOG_FLUSH = sys.stdout.isatty()
+# (segundo, timestamp formatado): strftime no máximo uma vez por segundo
+_LOG_TS = (0, b'')
+
+# Requisições rodam em threads: serializa as escritas em MOCK_INCIDENTS
+_INCIDENTS_LOCK = threading.Lock()
+
+# JSON compacto da lista completa, refeito só depois de um POST
+_INCIDENTS_CACHE = None
+
+# Próximo id de incidente (evita varrer a lista a cada POST)
+_NEXT_ID = max(incident['id'] for incident in MOCK_INCIDENTS) + 1
+
 class MockAPIHandler(BaseHTTPRequestHandler):
-    def _set_headers(self, content_type='application/json'):
-        self.send_response(200)
+    # HTTP/1.1 mantém a conexão aberta entre requisições (exige Content-Length)
+    protocol_version = 'HTTP/1.1'
+    # Headers e corpo saem em writes separados: sem Nagle para não atrasar o corpo
+    disable_nagle_algorithm = True
+
+    def _send(self, body=b'', status=200, content_type='application/json'):
+        """Envia status, headers (com Content-Length) e o corpo já serializado"""
+        self.send_response(status)
         self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Origin, X-Requested-With, Content-Type, Accept, Authorization')
+        if self.close_connection:
+            # Avisar clientes keep-alive de que o socket será fechado
+            self.send_header('Connection', 'close')
         self.end_headers()
+        if body:
+            self.wfile.write(body)
 
     def do_OPTIONS(self):
-        self._set_headers()
+        self._send()
 
     def do_GET(self):
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
         query = urllib.parse.parse_qs(parsed_path.query)
+        # JSON compacto por padrão; ?pretty=1 indenta para depuração
+        pretty = query.get('pretty', [''])[0] == '1'
 
         if path == '/api/health':
-            self._set_headers()
-            response = {
-                "success": True,
-                "status": "healthy",
-                "timestamp": datetime.now().isoformat(),
-                "database": "connected (mock)",
-                "architecture": "Python Mock API"
-            }
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            if pretty:
+                response = {
+                    "success": True,
+                    "status": "healthy",
+                    "timestamp": datetime.now().isoformat(),
+                    "database": "connected (mock)",
+                    "architecture": "Python Mock API"
+                }
+                self._send(_dumps(response, indent=True))
+            else:
+                self._send(_HEALTH_TEMPLATE % datetime.now().isoformat().encode())
 
         elif path == '/api/incidents':
-            self._set_headers()
-            self.wfile.write(json.dumps(MOCK_INCIDENTS, indent=2).encode())
+            if pretty:
+                self._send(_dumps(MOCK_INCIDENTS, indent=True))
+            else:
+                self._send(self._incidents_json())
 
         elif path == '/api/incidents/search':
-            self._set_headers()
             q = query.get('q', [''])[0]
             if not q:
                 response = {"success": False, "error": "Search query parameter 'q' is required"}
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
+                self._send(_dumps(response), status=400)
                 return
 
             # Filter incidents based on search query
-            filtered = [
-                incident for incident in MOCK_INCIDENTS
-                if q.lower() in incident['title'].lower() or q.lower() in incident['description'].lower()
-            ]
+            ql = q.lower()
+            filtered = [MOCK_INCIDENTS[i] for i, text in enumerate(_SEARCH_INDEX) if ql in text]
 
             response = {
                 "success": True,
@@ -137,51 +195,89 @@ class MockAPIHandler(BaseHTTPRequestHandler):
                 "count": len(filtered),
                 "query": q
             }
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send(_dumps(response, indent=pretty))
 
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
             response = {"error": "Endpoint not found"}
-            self.wfile.write(json.dumps(response).encode())
+            self._send(_dumps(response), status=404)
+
+    def _incidents_json(self):
+        """Lista completa serializada, em cache até a próxima alteração"""
+        global _INCIDENTS_CACHE
+
+        body = _INCIDENTS_CACHE
+        if body is None:
+            with _INCIDENTS_LOCK:
+                if _INCIDENTS_CACHE is None:
+                    _INCIDENTS_CACHE = _dumps(MOCK_INCIDENTS)
+                body = _INCIDENTS_CACHE
+        return body
 
     def do_POST(self):
+        global _NEXT_ID, _INCIDENTS_CACHE
+
         if self.path == '/api/incidents':
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            # Corpo lido direto em um buffer pré-alocado; orjson/json aceitam bytearray
+            post_data = bytearray(content_length)
+            if self.rfile.readinto(post_data) < content_length:
+                self.close_connection = True
+                self._send(_dumps({"error": "Incomplete request body"}), status=400)
+                return
+            data = _loads(post_data)
+
+            # Mesmo formato ISO-8601 UTC dos dados de exemplo, formatado uma única vez
+            now = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
 
             # Create new incident
-            new_incident = {
-                "id": max([i['id'] for i in MOCK_INCIDENTS]) + 1,
-                "title": data.get('title'),
-                "description": data.get('description'),
-                "category": data.get('category'),
-                "severity": data.get('severity'),
-                "priority": data.get('priority', 'P3'),
-                "status": "aberto",
-                "reporter": data.get('reporter'),
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "type": "incident"
-            }
+            with _INCIDENTS_LOCK:
+                new_id = _NEXT_ID
+                _NEXT_ID += 1
+
+                new_incident = {
+                    "id": new_id,
+                    "title": data.get('title'),
+                    "description": data.get('description'),
+                    "category": data.get('category'),
+                    "severity": data.get('severity'),
+                    "priority": data.get('priority', 'P3'),
+                    "status": "aberto",
+                    "reporter": data.get('reporter'),
+                    "created_at": now,
+                    "updated_at": now,
+                    "type": "incident"
+                }
 
-            MOCK_INCIDENTS.append(new_incident)
+                MOCK_INCIDENTS.append(new_incident)
+                _SEARCH_INDEX.append(_search_text(new_incident))
+                _INCIDENTS_CACHE = None
 
-            self._set_headers()
             response = {"success": True, "data": new_incident}
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send(_dumps(response))
         else:
-            self.send_response(404)
-            self.end_headers()
+            # Corpo da requisição não foi lido: não reaproveitar a conexão
+            self.close_connection = True
+            self._send(status=404)
 
     def log_message(self, format, *args):
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {format % args}")
+        global _LOG_TS
+
+        if not _LOG_ENABLED:
+            return
+
+        now = int(time.time())
+        if now != _LOG_TS[0]:
+            _LOG_TS = (now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)).encode())
+
+        out = sys.stdout.buffer
+        out.write(b'[' + _LOG_TS[1] + b'] ' + (format % args).encode() + b'\n')
+        if _LOG_FLUSH:
+            out.flush()
 
 def run_server(port=3001):
     server_address = ('', port)
-    httpd = HTTPServer(server_address, MockAPIHandler)
+    # Uma thread por requisição (daemon: não segura o encerramento do servidor)
+    httpd = ThreadingHTTPServer(server_address, MockAPIHandler)
     print(f"🚀 Mock API Server running on http://localhost:{port}")
     print(f"📊 Available endpoints:")
     print(f"   GET  /api/health")
@@ -190,6 +286,8 @@ def run_server(port=3001):
     print(f"   POST /api/incidents")
     print(f"💾 Serving {len(MOCK_INCIDENTS)} mock incidents")
     print("Press Ctrl+C to stop")
+    # Logs de acesso vão direto para o buffer binário: não deixar o banner para trás
+    sys.stdout.flush()
 
     try:
         httpd.serve_forever()
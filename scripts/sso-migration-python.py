@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """
 SSO Migration Script for PostgreSQL
-Uses standard Python libraries - no external dependencies needed
+Requires psycopg2 and bcrypt
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
+import bcrypt
 import os
+from concurrent.futures import ThreadPoolExecutor
 import json
-import hashlib
-import secrets
 from datetime import datetime
 import sys
 
@@ -166,26 +167,55 @@ MIGRATIONS = [
     """
 ]
 
-# Indexes for performance
+# Indexes for performance (built CONCURRENTLY, outside the migration transaction)
 INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);",
-    "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);",
-    "CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON user_sessions(user_id);",
-    "CREATE INDEX IF NOT EXISTS idx_sessions_token ON user_sessions(session_token);",
-    "CREATE INDEX IF NOT EXISTS idx_api_keys_user_id ON encrypted_api_keys(user_id);",
-    "CREATE INDEX IF NOT EXISTS idx_audit_logs_user_id ON audit_logs(user_id);",
-    "CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);",
-    "CREATE INDEX IF NOT EXISTS idx_security_events_user_id ON security_events(user_id);",
-    "CREATE INDEX IF NOT EXISTS idx_security_events_timestamp ON security_events(timestamp);",
-    "CREATE INDEX IF NOT EXISTS idx_login_attempts_email ON login_attempts(email);",
-    "CREATE INDEX IF NOT EXISTS idx_login_attempts_timestamp ON login_attempts(timestamp);"
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email ON users(email);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_role ON users(role);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_user_id ON user_sessions(user_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_token ON user_sessions(session_token);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_api_keys_user_id ON encrypted_api_keys(user_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_logs_user_id ON audit_logs(user_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_security_events_user_id ON security_events(user_id);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_security_events_timestamp ON security_events(timestamp);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_login_attempts_email ON login_attempts(email);",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_login_attempts_timestamp ON login_attempts(timestamp);"
 ]
 
+# bcrypt cost factor (2^12 rounds); the $2a$ prefix is what the Node services' bcryptjs verifies
+BCRYPT_ROUNDS = 12
+
+# Parallel index builds, each on its own connection
+INDEX_WORKERS = min(4, len(INDEXES))
+# Per-session memory for each build (multiplied by INDEX_WORKERS); server default unless set
+INDEX_MAINTENANCE_WORK_MEM = os.environ.get('DB_MAINTENANCE_WORK_MEM')
+
+def index_name(index):
+    """Index name from a CREATE INDEX statement"""
+    return index.split(' IF NOT EXISTS ')[1].split(' ')[0]
+
+def create_index(index):
+    """Build one index on a dedicated autocommit connection; returns the error, if any"""
+    conn = None
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            if INDEX_MAINTENANCE_WORK_MEM:
+                cursor.execute("SET maintenance_work_mem = %s", (INDEX_MAINTENANCE_WORK_MEM,))
+            cursor.execute(index)
+        return None
+    except psycopg2.Error as e:
+        return e
+    finally:
+        if conn:
+            conn.close()
+
 def hash_password(password):
-    """Simple password hashing using SHA256"""
-    salt = secrets.token_hex(16)
-    pwd_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-    return f"{salt}${pwd_hash}"
+    """Password hashing with bcrypt (salt and cost are embedded in the hash)"""
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS, prefix=b"2a")
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
 def run_migration():
     """Execute the migration"""
@@ -199,25 +229,13 @@ def run_migration():
         cursor = conn.cursor()
         print("✅ Connected to PostgreSQL")
 
-        # Execute migrations
+        # Execute migrations in a single round-trip
+        # (a failure aborts the transaction and is rolled back below)
         print("\n📄 Creating tables...")
-        for i, migration in enumerate(MIGRATIONS, 1):
-            try:
-                cursor.execute(migration)
-                table_name = migration.split('CREATE TABLE IF NOT EXISTS ')[1].split(' ')[0]
-                print(f"  ✅ Table created: {table_name}")
-            except Exception as e:
-                print(f"  ⚠️ Error creating table: {e}")
-
-        # Create indexes
-        print("\n🔧 Creating indexes...")
-        for index in INDEXES:
-            try:
-                cursor.execute(index)
-                index_name = index.split('CREATE INDEX IF NOT EXISTS ')[1].split(' ')[0]
-                print(f"  ✅ Index created: {index_name}")
-            except Exception as e:
-                print(f"  ⚠️ Error creating index: {e}")
+        cursor.execute("\n".join(MIGRATIONS))
+        for migration in MIGRATIONS:
+            table_name = migration.split('CREATE TABLE IF NOT EXISTS ')[1].split(' ')[0]
+            print(f"  ✅ Table created: {table_name}")
 
         # Insert default data
         print("\n📊 Inserting default data...")
@@ -236,17 +254,18 @@ def run_migration():
              '["openid", "profile", "email"]')
         ]
 
-        for provider in providers:
-            try:
-                cursor.execute("""
-                    INSERT INTO sso_configurations
-                    (id, name, provider, authorization_url, token_url, user_info_url, scopes, is_enabled)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, true)
-                    ON CONFLICT (id) DO NOTHING
-                """, provider)
+        # All providers in a single multi-row INSERT
+        try:
+            execute_values(cursor, """
+                INSERT INTO sso_configurations
+                (id, name, provider, authorization_url, token_url, user_info_url, scopes, is_enabled)
+                VALUES %s
+                ON CONFLICT (id) DO NOTHING
+            """, providers, template="(%s, %s, %s, %s, %s, %s, %s::jsonb, true)")
+            for provider in providers:
                 print(f"  ✅ Provider added: {provider[1]}")
-            except Exception as e:
-                print(f"  ⚠️ Error adding provider: {e}")
+        except Exception as e:
+            print(f"  ⚠️ Error adding providers: {e}")
 
         # Create default admin user
         admin_pwd_hash = hash_password("admin123")
@@ -265,6 +284,16 @@ def run_migration():
 
         # Commit all changes
         conn.commit()
+
+        # Create indexes in parallel, after the tables are committed and seeded
+        print("\n🔧 Creating indexes...")
+        with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as executor:
+            for index, error in zip(INDEXES, executor.map(create_index, INDEXES)):
+                if error is None:
+                    print(f"  ✅ Index created: {index_name(index)}")
+                else:
+                    print(f"  ⚠️ Error creating index {index_name(index)}: {error}")
+
         print("\n🎉 SSO migration completed successfully!")
 
         # Verify tables
@@ -311,5 +340,13 @@ if __name__ == "__main__":
         print("Please install it with: pip install psycopg2-binary")
         sys.exit(1)
 
+    # Check if bcrypt is available
+    try:
+        import bcrypt
+    except ImportError:
+        print("\n❌ Error: bcrypt is required but not installed.")
+        print("Please install it with: pip install bcrypt")
+        sys.exit(1)
+
     success = run_migration()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script de importação com geração de embeddings
+"""
+
+import asyncio
+import json
+import os
+import numpy as np
+import psycopg2
+from psycopg2.extras import execute_values
+from pgvector.psycopg2 import register_vector
+from openai import AsyncOpenAI
+
+# Configuração
+DB_CONFIG = {
+    "host": "localhost",
+    "port": 5432,
+    "database": "mainframe_ai",
+    "user": "mainframe_user",
+    "password": "mainframe_pass"
+}
+
+# Mesmo modelo dos serviços de busca (EMBEDDING_MODEL): embeddings de modelos
+# diferentes não são comparáveis, mesmo com a mesma dimensão. Aceita o nome curto
+# usado em embedding-config.js ("ada-002", "3-small") ou o nome completo da OpenAI
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL") or "ada-002"
+if not EMBEDDING_MODEL.startswith("text-embedding-"):
+    EMBEDDING_MODEL = "text-embedding-" + EMBEDDING_MODEL
+
+# Lotes simultâneos de embedding e textos por requisição (o endpoint aceita até 2048)
+MAX_CONCURRENT_EMBEDDINGS = 8
+EMBEDDING_BATCH_SIZE = 256
+
+# Linhas por INSERT multi-valores
+PAGE_SIZE = 500
+
+# Dados a importar (JSON gerado junto com este script)
+ENTRIES_PATH = "__ENTRIES_PATH__"
+
+with open(ENTRIES_PATH, 'rb') as f:
+    entries = json.load(f)
+
+# Cliente OpenAI
+openai_client = AsyncOpenAI()
+
+async def generate_embedding_batch(texts, semaphore):
+    """Gera embeddings de um lote de textos em uma única requisição"""
+    async with semaphore:
+        try:
+            response = await openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[text[:8000] for text in texts]  # Limitar tamanho
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            print(f"Erro ao gerar embeddings: {e}")
+            return [None] * len(texts)
+
+async def generate_embeddings(texts):
+    """Gera embeddings em lotes paralelos, limitados por MAX_CONCURRENT_EMBEDDINGS"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDINGS)
+    batches = [texts[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+    results = await asyncio.gather(*(generate_embedding_batch(batch, semaphore) for batch in batches))
+    return [embedding for batch in results for embedding in batch]
+
+def import_entries():
+    """Importa entradas com embeddings"""
+    print(f"Gerando embeddings para {len(entries)} entradas...")
+    embeddings = asyncio.run(generate_embeddings([entry['content'] for entry in entries]))
+    
+    rows = [
+        (
+            entry['uuid'], entry['title'], entry['content'],
+            entry['summary'], entry['category'], entry['tags'],
+            entry['confidence_score'], entry['source'],
+            np.asarray(embedding, dtype=np.float32), json.dumps(entry['metadata']),
+            entry['created_by']
+        )
+        for entry, embedding in zip(entries, embeddings)
+        if embedding
+    ]
+    
+    conn = psycopg2.connect(**DB_CONFIG)
+    # Adaptador do pgvector: arrays numpy vão direto para a coluna vector(1536)
+    register_vector(conn)
+    cur = conn.cursor()
+    
+    # Inserir no banco em lotes: um round-trip por página em vez de um por entrada
+    execute_values(cur, """
+        INSERT INTO knowledge_base (
+            uuid, title, content, summary, category, tags,
+            confidence_score, source, embedding, metadata,
+            created_by, created_at
+        ) VALUES %s
+        ON CONFLICT (uuid) DO UPDATE SET
+            content = EXCLUDED.content,
+            embedding = EXCLUDED.embedding,
+            updated_at = CURRENT_TIMESTAMP
+    """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)", page_size=PAGE_SIZE)
+    
+    conn.commit()
+    cur.close()
+    conn.close()
+    print(f"Importação concluída! {len(rows)} entradas inseridas.")
+
+if __name__ == "__main__":
+    import_entries()
@@ -31,16 +31,25 @@ Features:
 import os
 import sys
 import json
+import contextlib
+import codecs
+import functools
 import hashlib
 import uuid
 import re
 import mimetypes
-import base64
-from datetime import datetime
+import mmap
+import sqlite3
+import threading
+from datetime import date, datetime
 from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import logging
-from dataclasses import dataclass, asdict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from collections import Counter
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 
 # ================================================================================
@@ -57,8 +66,11 @@ logger = logging.getLogger(__name__)
 # ESTRUTURAS DE DADOS
 # ================================================================================
 
-class DocumentType(Enum):
-    """Tipos de documentos suportados"""
+# slots=True (Python 3.10+) evita um __dict__ por instância nos milhares de chunks gerados
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+class DocumentType(str, Enum):
+    """Tipos de documentos suportados (comparáveis e serializáveis como str)"""
     EXCEL = "excel"
     WORD = "word"
     PDF = "pdf"
@@ -71,7 +83,10 @@ class DocumentType(Enum):
     ARCHIVE = "archive"
     UNKNOWN = "unknown"
 
-@dataclass
+    def __str__(self) -> str:
+        return self.value
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DocumentMetadata:
     """Metadados do documento"""
     file_name: str
@@ -94,7 +109,7 @@ class DocumentMetadata:
     encoding: Optional[str]
     checksum: str
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DocumentChunk:
     """Chunk de documento para processamento"""
     chunk_id: str
@@ -106,7 +121,7 @@ class DocumentChunk:
     metadata: Dict[str, Any]
     embedding_text: str  # Texto otimizado para embedding
     
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class KnowledgeBaseEntry:
     """Entrada para a Knowledge Base"""
     uuid: str
@@ -123,126 +138,479 @@ class KnowledgeBaseEntry:
     created_by: str
     embedding_text: Optional[str] = None
 
+# Campos das dataclasses calculados uma vez, para serializar sem a reflexão/deepcopy do asdict
+_ENTRY_FIELDS = tuple(f.name for f in fields(KnowledgeBaseEntry))
+_CHUNK_FIELDS = tuple(f.name for f in fields(DocumentChunk))
+
+def _entry_to_dict(entry: KnowledgeBaseEntry) -> Dict[str, Any]:
+    """Equivalente raso de asdict(entry), suficiente para serialização"""
+    entry_dict = {name: getattr(entry, name) for name in _ENTRY_FIELDS}
+    entry_dict['chunks'] = [{name: getattr(chunk, name) for name in _CHUNK_FIELDS} for chunk in entry.chunks]
+    return entry_dict
+
 # ================================================================================
 # DETECTORES E EXTRACTORES
 # ================================================================================
 
+# Extensão -> (tipo, linguagem do código, MIME type): um único lookup devolve tudo;
+# mimetypes só é consultado para extensões fora da tabela
+_EXT_INFO: Dict[str, Tuple[DocumentType, Optional[str], str]] = {
+    # Excel
+    '.xlsx': (DocumentType.EXCEL, None, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    '.xls': (DocumentType.EXCEL, None, 'application/vnd.ms-excel'),
+    '.xlsm': (DocumentType.EXCEL, None, 'application/vnd.ms-excel.sheet.macroEnabled.12'),
+    '.csv': (DocumentType.EXCEL, None, 'text/csv'),
+    '.tsv': (DocumentType.EXCEL, None, 'text/tab-separated-values'),
+    
+    # Word
+    '.docx': (DocumentType.WORD, None, 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    '.doc': (DocumentType.WORD, None, 'application/msword'),
+    '.rtf': (DocumentType.WORD, None, 'application/rtf'),
+    '.odt': (DocumentType.WORD, None, 'application/vnd.oasis.opendocument.text'),
+    
+    # PDF
+    '.pdf': (DocumentType.PDF, None, 'application/pdf'),
+    
+    # PowerPoint
+    '.pptx': (DocumentType.POWERPOINT, None, 'application/vnd.openxmlformats-officedocument.presentationml.presentation'),
+    '.ppt': (DocumentType.POWERPOINT, None, 'application/vnd.ms-powerpoint'),
+    '.odp': (DocumentType.POWERPOINT, None, 'application/vnd.oasis.opendocument.presentation'),
+    
+    # Imagens
+    '.jpg': (DocumentType.IMAGE, None, 'image/jpeg'),
+    '.jpeg': (DocumentType.IMAGE, None, 'image/jpeg'),
+    '.png': (DocumentType.IMAGE, None, 'image/png'),
+    '.gif': (DocumentType.IMAGE, None, 'image/gif'),
+    '.bmp': (DocumentType.IMAGE, None, 'image/bmp'),
+    '.tiff': (DocumentType.IMAGE, None, 'image/tiff'),
+    '.tif': (DocumentType.IMAGE, None, 'image/tiff'),
+    '.webp': (DocumentType.IMAGE, None, 'image/webp'),
+    
+    # Texto
+    '.txt': (DocumentType.TEXT, None, 'text/plain'),
+    '.md': (DocumentType.TEXT, None, 'text/markdown'),
+    '.markdown': (DocumentType.TEXT, None, 'text/markdown'),
+    '.log': (DocumentType.TEXT, None, 'text/plain'),
+    '.json': (DocumentType.TEXT, None, 'application/json'),
+    '.xml': (DocumentType.TEXT, None, 'application/xml'),
+    '.yaml': (DocumentType.TEXT, None, 'application/yaml'),
+    '.yml': (DocumentType.TEXT, None, 'application/yaml'),
+    '.ini': (DocumentType.TEXT, None, 'text/plain'),
+    '.cfg': (DocumentType.TEXT, None, 'text/plain'),
+    '.conf': (DocumentType.TEXT, None, 'text/plain'),
+    
+    # Email
+    '.eml': (DocumentType.EMAIL, None, 'message/rfc822'),
+    '.msg': (DocumentType.EMAIL, None, 'application/vnd.ms-outlook'),
+    '.mbox': (DocumentType.EMAIL, None, 'application/mbox'),
+    
+    # HTML
+    '.html': (DocumentType.HTML, None, 'text/html'),
+    '.htm': (DocumentType.HTML, None, 'text/html'),
+    '.xhtml': (DocumentType.HTML, None, 'application/xhtml+xml'),
+    
+    # Código
+    '.py': (DocumentType.CODE, 'python', 'text/x-python'),
+    '.js': (DocumentType.CODE, 'javascript', 'text/javascript'),
+    '.java': (DocumentType.CODE, 'java', 'text/x-java'),
+    '.c': (DocumentType.CODE, 'c', 'text/x-csrc'),
+    '.cpp': (DocumentType.CODE, 'cpp', 'text/x-c++src'),
+    '.cs': (DocumentType.CODE, 'csharp', 'text/x-csharp'),
+    '.php': (DocumentType.CODE, 'php', 'application/x-php'),
+    '.rb': (DocumentType.CODE, 'ruby', 'application/x-ruby'),
+    '.go': (DocumentType.CODE, 'go', 'text/x-go'),
+    '.rs': (DocumentType.CODE, 'rust', 'text/x-rust'),
+    '.swift': (DocumentType.CODE, 'swift', 'text/x-swift'),
+    '.kt': (DocumentType.CODE, 'kotlin', 'text/x-kotlin'),
+    '.scala': (DocumentType.CODE, 'scala', 'text/x-scala'),
+    '.r': (DocumentType.CODE, 'r', 'text/x-r'),
+    '.sql': (DocumentType.CODE, 'sql', 'application/sql'),
+    '.sh': (DocumentType.CODE, 'shell', 'text/x-sh'),
+    '.bat': (DocumentType.CODE, 'batch', 'application/x-msdos-program'),
+    '.ps1': (DocumentType.CODE, 'powershell', 'text/x-powershell'),
+    
+    # Archives
+    '.zip': (DocumentType.ARCHIVE, None, 'application/zip'),
+    '.rar': (DocumentType.ARCHIVE, None, 'application/vnd.rar'),
+    '.7z': (DocumentType.ARCHIVE, None, 'application/x-7z-compressed'),
+    '.tar': (DocumentType.ARCHIVE, None, 'application/x-tar'),
+    '.gz': (DocumentType.ARCHIVE, None, 'application/gzip'),
+    '.bz2': (DocumentType.ARCHIVE, None, 'application/x-bzip2'),
+}
+
+_UNKNOWN_INFO = (DocumentType.UNKNOWN, None, None)
+
+# Visão extensão -> tipo derivada da tabela acima
+_EXT_MAP: Dict[str, DocumentType] = {ext: info[0] for ext, info in _EXT_INFO.items()}
+
+# Mapeamento inverso tipo -> extensões, para filtros por tipo sem construir DocumentType
+_TYPE_EXTS: Dict[DocumentType, frozenset] = {}
+for _ext, _type in _EXT_MAP.items():
+    _TYPE_EXTS.setdefault(_type, set()).add(sys.intern(_ext))
+_TYPE_EXTS = {_type: frozenset(_exts) for _type, _exts in _TYPE_EXTS.items()}
+del _ext, _type
+
+def _suffix(file_path: str) -> str:
+    """Extensão em minúsculas (com ponto) ou string vazia"""
+    i = file_path.rfind('.')
+    return file_path[i:].lower() if i >= 0 else ''
+
+# Bytes lidos do início do arquivo para detecção por conteúdo
+_HEADER_BYTES = 4096
+
+# Assinaturas (magic numbers) dos formatos suportados
+_MAGIC_NUMBERS = (
+    (b'%PDF-', DocumentType.PDF),
+    (b'PK\x03\x04', DocumentType.ARCHIVE),
+    (b'{\\rtf', DocumentType.WORD),
+    (b'\x89PNG\r\n\x1a\n', DocumentType.IMAGE),
+    (b'\xff\xd8\xff', DocumentType.IMAGE),
+    (b'GIF87a', DocumentType.IMAGE),
+    (b'GIF89a', DocumentType.IMAGE),
+    (b'II*\x00', DocumentType.IMAGE),
+    (b'MM\x00*', DocumentType.IMAGE),
+    (b'Rar!\x1a\x07', DocumentType.ARCHIVE),
+    (b"7z\xbc\xaf'\x1c", DocumentType.ARCHIVE),
+    (b'\x1f\x8b', DocumentType.ARCHIVE),
+    (b'BZh', DocumentType.ARCHIVE),
+)
+
+# Diretórios internos dos formatos Office Open XML
+_OOXML_MARKERS = (
+    (b'word/', DocumentType.WORD),
+    (b'xl/', DocumentType.EXCEL),
+    (b'ppt/', DocumentType.POWERPOINT),
+)
+
+# Rótulos do Magika -> tipo, para arquivos sem extensão nem assinatura reconhecidas
+_MAGIKA_LABELS: Dict[str, DocumentType] = {
+    **dict.fromkeys(('xls', 'xlsx', 'ods'), DocumentType.EXCEL),
+    **dict.fromkeys(('doc', 'docx', 'rtf', 'odt'), DocumentType.WORD),
+    'pdf': DocumentType.PDF,
+    **dict.fromkeys(('ppt', 'pptx', 'odp'), DocumentType.POWERPOINT),
+    **dict.fromkeys(('png', 'jpeg', 'gif', 'bmp', 'tiff', 'webp'), DocumentType.IMAGE),
+    **dict.fromkeys(('txt', 'markdown', 'rst', 'csv', 'json', 'xml', 'yaml', 'ini'), DocumentType.TEXT),
+    **dict.fromkeys(('eml', 'outlook'), DocumentType.EMAIL),
+    'html': DocumentType.HTML,
+    **dict.fromkeys(('python', 'javascript', 'java', 'c', 'cpp', 'cs', 'php', 'ruby', 'go', 'rust',
+                     'swift', 'kotlin', 'scala', 'r', 'sql', 'shell', 'batch', 'powershell',
+                     'cobol', 'asm', 'vba'), DocumentType.CODE),
+    **dict.fromkeys(('zip', 'rar', 'tar', 'gzip', 'bzip'), DocumentType.ARCHIVE),
+}
+
+@functools.lru_cache(maxsize=1)
+def _magika():
+    """Classificador Magika sob demanda (None se não instalado)"""
+    try:
+        from magika import Magika
+    except ImportError:
+        return None
+    return Magika()
+
 class DocumentTypeDetector:
     """Detecta o tipo de documento baseado em extensão e conteúdo"""
     
-    EXTENSION_MAP = {
-        # Excel
-        '.xlsx': DocumentType.EXCEL,
-        '.xls': DocumentType.EXCEL,
-        '.xlsm': DocumentType.EXCEL,
-        '.csv': DocumentType.EXCEL,
-        '.tsv': DocumentType.EXCEL,
-        
-        # Word
-        '.docx': DocumentType.WORD,
-        '.doc': DocumentType.WORD,
-        '.rtf': DocumentType.WORD,
-        '.odt': DocumentType.WORD,
-        
-        # PDF
-        '.pdf': DocumentType.PDF,
-        
-        # PowerPoint
-        '.pptx': DocumentType.POWERPOINT,
-        '.ppt': DocumentType.POWERPOINT,
-        '.odp': DocumentType.POWERPOINT,
-        
-        # Imagens
-        '.jpg': DocumentType.IMAGE,
-        '.jpeg': DocumentType.IMAGE,
-        '.png': DocumentType.IMAGE,
-        '.gif': DocumentType.IMAGE,
-        '.bmp': DocumentType.IMAGE,
-        '.tiff': DocumentType.IMAGE,
-        '.tif': DocumentType.IMAGE,
-        '.webp': DocumentType.IMAGE,
-        
-        # Texto
-        '.txt': DocumentType.TEXT,
-        '.md': DocumentType.TEXT,
-        '.markdown': DocumentType.TEXT,
-        '.log': DocumentType.TEXT,
-        '.json': DocumentType.TEXT,
-        '.xml': DocumentType.TEXT,
-        '.yaml': DocumentType.TEXT,
-        '.yml': DocumentType.TEXT,
-        '.ini': DocumentType.TEXT,
-        '.cfg': DocumentType.TEXT,
-        '.conf': DocumentType.TEXT,
-        
-        # Email
-        '.eml': DocumentType.EMAIL,
-        '.msg': DocumentType.EMAIL,
-        '.mbox': DocumentType.EMAIL,
-        
-        # HTML
-        '.html': DocumentType.HTML,
-        '.htm': DocumentType.HTML,
-        '.xhtml': DocumentType.HTML,
-        
-        # Código
-        '.py': DocumentType.CODE,
-        '.js': DocumentType.CODE,
-        '.java': DocumentType.CODE,
-        '.c': DocumentType.CODE,
-        '.cpp': DocumentType.CODE,
-        '.cs': DocumentType.CODE,
-        '.php': DocumentType.CODE,
-        '.rb': DocumentType.CODE,
-        '.go': DocumentType.CODE,
-        '.rs': DocumentType.CODE,
-        '.swift': DocumentType.CODE,
-        '.kt': DocumentType.CODE,
-        '.scala': DocumentType.CODE,
-        '.r': DocumentType.CODE,
-        '.sql': DocumentType.CODE,
-        '.sh': DocumentType.CODE,
-        '.bat': DocumentType.CODE,
-        '.ps1': DocumentType.CODE,
-        
-        # Archives
-        '.zip': DocumentType.ARCHIVE,
-        '.rar': DocumentType.ARCHIVE,
-        '.7z': DocumentType.ARCHIVE,
-        '.tar': DocumentType.ARCHIVE,
-        '.gz': DocumentType.ARCHIVE,
-        '.bz2': DocumentType.ARCHIVE,
-    }
+    EXTENSION_MAP = _EXT_MAP
     
     @classmethod
     def detect(cls, file_path: str) -> DocumentType:
         """Detecta o tipo de documento"""
-        ext = Path(file_path).suffix.lower()
-        return cls.EXTENSION_MAP.get(ext, DocumentType.UNKNOWN)
+        return _EXT_MAP.get(_suffix(file_path), DocumentType.UNKNOWN)
+    
+    @classmethod
+    def detect_with_language(cls, file_path: str) -> Tuple[DocumentType, Optional[str]]:
+        """Detecta o tipo de documento e, para código, a linguagem"""
+        return _EXT_INFO.get(_suffix(file_path), _UNKNOWN_INFO)[:2]
+    
+    @classmethod
+    def is_type(cls, file_path: str, doc_type: DocumentType) -> bool:
+        """Verifica se o arquivo pertence a um tipo de documento"""
+        return _suffix(file_path) in _TYPE_EXTS.get(doc_type, frozenset())
+    
+    @classmethod
+    def detect_from_bytes(cls, header: bytes) -> DocumentType:
+        """Detecta o tipo pelos primeiros bytes do arquivo (assinaturas conhecidas)"""
+        for signature, doc_type in _MAGIC_NUMBERS:
+            if header.startswith(signature):
+                if header.startswith(b'PK\x03\x04'):
+                    # Formatos Office Open XML são ZIPs; o primeiro diretório indica o tipo
+                    for marker, office_type in _OOXML_MARKERS:
+                        if marker in header:
+                            return office_type
+                return doc_type
+        
+        if header[257:262] == b'ustar':
+            return DocumentType.ARCHIVE
+        
+        stripped = header.lstrip().lower()
+        if stripped.startswith((b'<!doctype html', b'<html')):
+            return DocumentType.HTML
+        
+        # Sem bytes nulos e decodificável como UTF-8: texto
+        if b'\x00' not in header:
+            try:
+                header.decode('utf-8')
+                return DocumentType.TEXT
+            except UnicodeDecodeError as e:
+                # Caractere multibyte cortado no fim do cabeçalho
+                if e.start >= len(header) - 3:
+                    return DocumentType.TEXT
+        
+        return DocumentType.UNKNOWN
+    
+    @classmethod
+    def detect_from_model(cls, file_paths: List[str]) -> List[DocumentType]:
+        """Classifica os arquivos com o Magika em uma única chamada (inferência em lote)"""
+        magika = _magika()
+        if magika is None or not file_paths:
+            return [DocumentType.UNKNOWN] * len(file_paths)
+        
+        return [
+            _MAGIKA_LABELS.get(str(result.output.label), DocumentType.UNKNOWN)
+            if result.ok else DocumentType.UNKNOWN
+            for result in magika.identify_paths([Path(p) for p in file_paths])
+        ]
+    
+    @classmethod
+    def detect_from_file(cls, file_path: str, use_model: bool = True) -> DocumentType:
+        """
+        Detecta o tipo pela extensão e, se desconhecida, pelo conteúdo:
+        assinaturas conhecidas e, em último caso, o Magika (se instalado)
+        """
+        doc_type = cls.detect(file_path)
+        if doc_type is DocumentType.UNKNOWN:
+            try:
+                with open(file_path, 'rb') as f:
+                    doc_type = cls.detect_from_bytes(f.read(_HEADER_BYTES))
+            except OSError:
+                return doc_type
+            if doc_type is DocumentType.UNKNOWN and use_model:
+                doc_type = cls.detect_from_model([file_path])[0]
+        return doc_type
+
+class _KeywordScanner:
+    """
+    Encontra quais palavras-chave ocorrem no texto em uma única passada.
+    Usa um autômato Aho-Corasick (pyahocorasick) quando disponível; caso
+    contrário, uma única regex com alternância sem distinção de maiúsculas,
+    evitando uma cópia em minúsculas de todo o conteúdo.
+    """
+    
+    def __init__(self, keywords: List[str]):
+        self.keywords = frozenset(keyword.lower() for keyword in keywords)
+        self._automaton = None
+        self._pattern = None
+    
+    def _compile(self):
+        try:
+            import ahocorasick
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+        except ImportError:
+            # Lookahead permite ocorrências sobrepostas; mais longas primeiro
+            alternatives = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+            self._pattern = re.compile(f"(?=({alternatives}))", re.IGNORECASE)
+    
+    def find(self, text: str, lower=str.lower) -> set:
+        """Conjunto das palavras-chave presentes no texto"""
+        if self._automaton is None and self._pattern is None:
+            self._compile()
+        
+        found = set()
+        matches = (
+            # O autômato só compara minúsculas
+            (keyword for _, keyword in self._automaton.iter(lower(text))) if self._automaton is not None
+            else (match.group(1).lower() for match in self._pattern.finditer(text))
+        )
+        for keyword in matches:
+            found.add(keyword)
+            if len(found) == len(self.keywords):
+                break
+        return found
+
+# Palavras-chave de tags por processador
+_EXCEL_KEYWORDS = _KeywordScanner(['CICS', 'DB2', 'IMS', 'COBOL', 'JCL', 'VSAM', 'Mainframe', 'Batch', 'Online'])
+_PDF_KEYWORDS = _KeywordScanner(['manual', 'guide', 'tutorial', 'specification', 'documentation'])
+_WORD_DOC_TYPES = {
+    'manual': frozenset(['manual', 'instruções', 'instructions']),
+    'relatório': frozenset(['relatório', 'report', 'análise']),
+    'procedimento': frozenset(['procedimento', 'procedure', 'processo']),
+    'política': frozenset(['política', 'policy', 'norma'])
+}
+_WORD_KEYWORDS = _KeywordScanner([k for keywords in _WORD_DOC_TYPES.values() for k in keywords])
+_MAINFRAME_KEYWORDS = _KeywordScanner([
+    'mainframe', 'cobol', 'jcl', 'cics', 'db2', 'ims', 'vsam',
+    'rexx', 'racf', 'tso', 'ispf', 'sdsf', 'sort', 'idcams'
+])
+_LOG_KEYWORDS = _KeywordScanner(['error', 'warning', 'info', 'debug', 'trace'])
 
 # ================================================================================
 # PROCESSADORES ESPECÍFICOS
 # ================================================================================
 
+@functools.lru_cache(maxsize=1)
+def _import_pandas():
+    """Importa pandas sob demanda; só o processador Excel precisa dele"""
+    import pandas as pd
+    return pd
+
+def _checksum(path: str) -> str:
+    """Calcula SHA256 sem carregar o arquivo inteiro no heap do Python"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        
+        # mmap: os bytes vão do page cache direto para o hashlib em uma única chamada C
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except (OSError, ValueError):
+            pass
+        
+        # Arquivos que não podem ser mapeados: leitura em blocos
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        sha256 = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+        return sha256.hexdigest()
+
+# Cache persistente (caminho, tamanho, mtime) -> SHA256, opcional e desativado por padrão:
+# UniversalDocumentProcessor(checksum_cache=True) o mantém em output_dir, e a variável
+# KB_CHECKSUM_CACHE aponta um arquivo para qualquer uso da biblioteca
+_CHECKSUM_CACHE_ENV = os.environ.get("KB_CHECKSUM_CACHE") or None
+_checksum_cache_path: Optional[str] = _CHECKSUM_CACHE_ENV
+# (pid, conexão) do processo atual; conexão None se o cache não pôde ser aberto
+_checksum_conn: Optional[Tuple[int, Optional[sqlite3.Connection]]] = None
+
+def _checksum_cache() -> Optional[sqlite3.Connection]:
+    """Conexão com o cache de checksums deste processo (None se desativado ou indisponível)"""
+    global _checksum_conn
+    if not _checksum_cache_path:
+        return None
+    
+    # Conexão herdada por fork não é reaproveitada: cada processo abre a sua
+    pid = os.getpid()
+    if _checksum_conn is not None and _checksum_conn[0] == pid:
+        return _checksum_conn[1]
+    
+    conn = None
+    try:
+        Path(_checksum_cache_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_checksum_cache_path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS checksums ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT)"
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Cache de checksums indisponível: {str(e)}")
+        if conn is not None:
+            conn.close()
+        conn = None
+    
+    _checksum_conn = (pid, conn)
+    return conn
+
+def _close_checksum_cache():
+    """Fecha a conexão do cache de checksums aberta por este processo"""
+    global _checksum_conn
+    if _checksum_conn is not None and _checksum_conn[0] == os.getpid() and _checksum_conn[1] is not None:
+        _checksum_conn[1].close()
+    _checksum_conn = None
+
+def _set_checksum_cache(path: Optional[str]):
+    """Troca o arquivo do cache de checksums (também é o initializer dos workers)"""
+    global _checksum_cache_path
+    if path != _checksum_cache_path:
+        _close_checksum_cache()
+        _checksum_cache_path = path
+
+@contextlib.contextmanager
+def _checksum_cache_scope(path: Optional[str]):
+    """Usa o cache de checksums em path durante o bloco e fecha a conexão ao final"""
+    previous = _checksum_cache_path
+    _set_checksum_cache(path)
+    try:
+        yield
+    finally:
+        _close_checksum_cache()
+        _set_checksum_cache(previous)
+
+def _cached_checksum(path: str) -> str:
+    """Retorna o SHA256 do cache se o arquivo não mudou; senão calcula e grava"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    conn = _checksum_cache()
+    
+    if conn is not None:
+        try:
+            row = conn.execute(
+                "SELECT digest FROM checksums WHERE path = ? AND size = ? AND mtime_ns = ?", key
+            ).fetchone()
+            if row:
+                return row[0]
+        except sqlite3.Error:
+            # Cache bloqueado ou corrompido: calcular o hash normalmente
+            conn = None
+    
+    digest = _checksum(path)
+    
+    if conn is not None:
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO checksums (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                    key + (digest,)
+                )
+        except sqlite3.Error:
+            pass
+    
+    return digest
+
 class BaseProcessor:
     """Classe base para processadores de documentos"""
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: Optional[str] = None):
+        if file_path is not None:
+            self._bind(file_path)
+    
+    def _bind(self, file_path: str):
+        """Associa o processador a um arquivo, descartando o estado do arquivo anterior"""
+        self.__dict__.clear()
         self.file_path = file_path
         self.file_name = Path(file_path).name
-        self.metadata = self._extract_metadata()
+    
+    @functools.cached_property
+    def metadata(self) -> DocumentMetadata:
+        """Metadados extraídos sob demanda (instanciar o processador não lê o arquivo)"""
+        return self._extract_metadata()
+    
+    @functools.cached_property
+    def checksum(self) -> str:
+        """SHA256 do arquivo, reaproveitado do cache persistente (se ativo) quando inalterado"""
+        return _cached_checksum(self.file_path)
     
     def _extract_metadata(self) -> DocumentMetadata:
         """Extrai metadados básicos do arquivo"""
         path = Path(self.file_path)
         stat = path.stat()
         
+        known = _EXT_INFO.get(_suffix(self.file_path))
+        if known is not None:
+            file_type, _, mime_type = known
+        else:
+            file_type = DocumentType.UNKNOWN
+            mime_type = mimetypes.guess_type(self.file_path)[0] or 'application/octet-stream'
+        
         return DocumentMetadata(
             file_name=self.file_name,
             file_path=str(path.absolute()),
             file_size=stat.st_size,
-            file_type=DocumentTypeDetector.detect(self.file_path),
-            mime_type=mimetypes.guess_type(self.file_path)[0] or 'application/octet-stream',
+            file_type=file_type,
+            mime_type=mime_type,
             created_date=datetime.fromtimestamp(stat.st_ctime),
             modified_date=datetime.fromtimestamp(stat.st_mtime),
             author=None,
@@ -256,71 +624,151 @@ class BaseProcessor:
             has_tables=False,
             has_attachments=False,
             encoding=None,
-            checksum=self._calculate_checksum()
+            checksum=self.checksum
         )
     
     def _calculate_checksum(self) -> str:
         """Calcula checksum SHA256 do arquivo"""
-        sha256 = hashlib.sha256()
-        with open(self.file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        return _checksum(self.file_path)
+    
+    def _lowered(self, content: str) -> str:
+        """content.lower() calculado uma única vez por conteúdo processado"""
+        cached = self.__dict__.get('_lower_cache')
+        if cached is None or cached[0] is not content:
+            cached = self._lower_cache = (content, content.lower())
+        return cached[1]
     
     def process(self) -> List[KnowledgeBaseEntry]:
         """Processa o documento e retorna entradas para KB"""
         raise NotImplementedError("Subclasses devem implementar process()")
+    
+    def process_file(self, file_path: str) -> List[KnowledgeBaseEntry]:
+        """Processa outro arquivo reutilizando esta instância"""
+        self._bind(file_path)
+        try:
+            return self.process()
+        finally:
+            # Não reter conteúdo do arquivo entre chamadas
+            self.__dict__.clear()
+
+# Opções do openpyxl para leitura em massa: modo read-only, valores calculados, sem links externos
+_OPENPYXL_KWARGS = {'read_only': True, 'data_only': True, 'keep_links': False}
+
+@functools.lru_cache(maxsize=1)
+def _excel_read_options() -> Dict[str, Any]:
+    """
+    Prefere o engine calamine (Rust, pandas >= 2.2): leitura várias vezes mais
+    rápida e com bem menos memória que o openpyxl. Sem python-calamine,
+    usa openpyxl em modo read-only.
+    """
+    try:
+        import python_calamine  # noqa: F401
+        return {'engine': 'calamine'}
+    except ImportError:
+        return {'engine': 'openpyxl', 'engine_kwargs': _OPENPYXL_KWARGS}
+
+# Abaixo deste tamanho o custo de subir processos supera o ganho do paralelismo por sheet
+_PARALLEL_SHEETS_MIN_BYTES = 1 << 20
+
+# Acima deste número de linhas a sheet vira uma única entrada colunar
+_SHEET_ROW_LIMIT = 1000
+# Valores mais frequentes usados no texto de embedding de cada coluna
+_COLUMN_TOP_VALUES = 20
+
+# Palavras que indicam colunas de identificação, usadas no título das entradas
+_TITLE_KEYWORDS = ('nome', 'name', 'título', 'title', 'id', 'código', 'code')
+
+def _process_excel_sheet(processor: "ExcelProcessor", sheet_name: str) -> List[KnowledgeBaseEntry]:
+    """Worker (nível de módulo para ser picklável): lê e processa uma única sheet"""
+    pd = _import_pandas()
+    df = pd.read_excel(processor.file_path, sheet_name=sheet_name, **processor._read_options())
+    return processor._process_sheet(df, sheet_name)
 
 class ExcelProcessor(BaseProcessor):
     """Processador para arquivos Excel"""
     
     def process(self) -> List[KnowledgeBaseEntry]:
         """Processa arquivo Excel"""
-        import pandas as pd
+        pd = _import_pandas()
         entries = []
         
         try:
-            # Ler todas as sheets
-            all_sheets = pd.read_excel(self.file_path, sheet_name=None, engine='openpyxl')
-            
-            for sheet_name, df in all_sheets.items():
-                # Limpar dados
-                df = df.dropna(how='all').dropna(axis=1, how='all')
-                
-                if df.empty:
-                    continue
-                
-                # Processar cada linha como uma entrada potencial
-                for idx, row in df.iterrows():
-                    entry = self._create_entry_from_row(row, df.columns, sheet_name, idx)
-                    if entry:
-                        entries.append(entry)
+            with pd.ExcelFile(self.file_path, **self._read_options()) as xls:
+                sheet_names = xls.sheet_names
                 
-                # Processar também a sheet inteira como uma entrada
-                sheet_entry = self._create_entry_from_sheet(df, sheet_name)
-                if sheet_entry:
-                    entries.append(sheet_entry)
+                # Distribuir sheets entre processos (não aninhar pools dentro de um worker)
+                if (len(sheet_names) > 1
+                        and self.metadata.file_size >= _PARALLEL_SHEETS_MIN_BYTES
+                        and multiprocessing.parent_process() is None):
+                    workers = min(len(sheet_names), os.cpu_count() or 1)
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        for sheet_entries in executor.map(_process_excel_sheet, repeat(self), sheet_names):
+                            entries.extend(sheet_entries)
+                else:
+                    for sheet_name in sheet_names:
+                        entries.extend(self._process_sheet(xls.parse(sheet_name), sheet_name))
         
         except Exception as e:
             logger.error(f"Erro ao processar Excel {self.file_name}: {str(e)}")
         
         return entries
     
-    def _create_entry_from_row(self, row, columns, sheet_name: str, row_index: int) -> Optional[KnowledgeBaseEntry]:
-        """Cria entrada KB de uma linha do Excel"""
-        import pandas as pd
-
+    def _read_options(self) -> Dict[str, Any]:
+        """Argumentos de engine para pandas.read_excel / ExcelFile"""
+        return _excel_read_options()
+    
+    def _process_sheet(self, df, sheet_name: str) -> List[KnowledgeBaseEntry]:
+        """Processa uma sheet: uma entrada por linha e uma para a sheet inteira"""
+        entries = []
+        # Repetido em todas as entradas e chunks da sheet
+        sheet_name = sys.intern(str(sheet_name))
+        
+        # Limpar dados
+        df = df.dropna(how='all').dropna(axis=1, how='all')
+        
+        if df.empty:
+            return entries
+        
+        columns = df.columns.tolist()
+        
+        # Sheets grandes: uma entrada colunar em vez de milhares de entradas por linha
+        if len(df) > _SHEET_ROW_LIMIT:
+            entries.append(self._create_columnar_entry(df, columns, sheet_name))
+            sheet_entry = self._create_entry_from_sheet(df, sheet_name)
+            if sheet_entry:
+                entries.append(sheet_entry)
+            return entries
+        
+        # Heurística: colunas com nomes importantes vão para o título (avaliada uma vez por sheet)
+        title_flags = [any(keyword in str(col).lower() for keyword in _TITLE_KEYWORDS) for col in columns]
+        # Máscara de não-nulos calculada de uma vez; as linhas vêm como tuplas simples
+        present = df.notna().to_numpy()
+        
+        # Processar cada linha como uma entrada potencial
+        for (idx, *row), row_present in zip(df.itertuples(index=True, name=None), present):
+            entry = self._create_entry_from_row(row, row_present, columns, title_flags, sheet_name, idx)
+            if entry:
+                entries.append(entry)
+        
+        # Processar também a sheet inteira como uma entrada
+        sheet_entry = self._create_entry_from_sheet(df, sheet_name)
+        if sheet_entry:
+            entries.append(sheet_entry)
+        
+        return entries
+    
+    def _create_entry_from_row(self, row, row_present, columns, title_flags, sheet_name: str, row_index: int) -> Optional[KnowledgeBaseEntry]:
+        """Cria entrada KB de uma linha do Excel (valores crus + máscara de não-nulos)"""
         # Identificar campos importantes
         title_parts = []
         content_parts = []
 
-        for col in columns:
-            value = row.get(col)
-            if pd.notna(value) and str(value).strip():
-                value_str = str(value).strip()
-                
-                # Heurística: colunas com nomes importantes vão para o título
-                if any(keyword in col.lower() for keyword in ['nome', 'name', 'título', 'title', 'id', 'código', 'code']):
+        for col, is_title, value, is_present in zip(columns, title_flags, row, row_present):
+            if not is_present:
+                continue
+            value_str = str(value).strip()
+            if value_str:
+                if is_title:
                     title_parts.append(value_str)
                 
                 content_parts.append(f"{col}: {value_str}")
@@ -360,14 +808,65 @@ class ExcelProcessor(BaseProcessor):
             confidence_score=0.8,
             source=self.file_name,
             document_type="excel",
+            # Dict próprio (não compartilhado com o chunk); só o nome da sheet, internado, é comum
             metadata={"sheet": sheet_name, "row": row_index},
             chunks=[chunk],
             created_by="auto_import"
         )
     
+    def _create_columnar_entry(self, df, columns, sheet_name: str) -> KnowledgeBaseEntry:
+        """
+        Cria uma entrada para a sheet inteira com um chunk por coluna. O conteúdo
+        de cada chunk tem um valor por linha, alinhado com metadata["rows"].
+        """
+        chunks = []
+        column_summaries = []
+        tags = set()
+        
+        for i, col in enumerate(columns):
+            series = df.iloc[:, i]
+            present = series.notna().to_numpy()
+            texts = [str(value).strip() if is_present else ''
+                     for value, is_present in zip(series.to_numpy(dtype=object), present)]
+            content = "\n".join(texts)
+            
+            # Texto de embedding: nome da coluna + valores mais frequentes
+            top_values = [value for value, _ in Counter(t for t in texts if t).most_common(_COLUMN_TOP_VALUES)]
+            embedding_text = f"{col}: {', '.join(top_values)}"
+            column_summaries.append(embedding_text)
+            tags |= _EXCEL_KEYWORDS.find(content)
+            
+            chunks.append(DocumentChunk(
+                chunk_id=f"{sheet_name}_col_{i}",
+                document_id=self.metadata.checksum,
+                content=content,
+                content_type="table_column",
+                chunk_index=i,
+                total_chunks=len(columns),
+                metadata={"sheet": sheet_name, "column": str(col), "non_null": int(present.sum())},
+                embedding_text=embedding_text
+            ))
+        
+        content = f"Sheet: {sheet_name}\nLinhas: {len(df)}\nColunas: {len(columns)}\n\n" + "\n".join(column_summaries)
+        
+        return KnowledgeBaseEntry(
+            uuid=str(uuid.uuid4()),
+            title=f"[Excel Tabela] {sheet_name} - {self.file_name}",
+            content=content,
+            summary=content[:500],
+            category="Spreadsheet Data",
+            tags=list(tags),
+            confidence_score=0.8,
+            source=self.file_name,
+            document_type="excel",
+            metadata={"sheet": sheet_name, "layout": "columnar", "rows": df.index.tolist()},
+            chunks=chunks,
+            created_by="auto_import"
+        )
+    
     def _create_entry_from_sheet(self, df, sheet_name: str) -> Optional[KnowledgeBaseEntry]:
         """Cria entrada KB de uma sheet inteira"""
-        import pandas as pd
+        pd = _import_pandas()
 
         if df.empty:
             return None
@@ -384,7 +883,7 @@ class ExcelProcessor(BaseProcessor):
         
         # Adicionar amostra de dados
         content += "\n\nAmostra de dados:\n"
-        content += df.head(10).to_string()
+        content += df.head(10).to_csv(sep='\t', index=False, lineterminator='\n')
         
         return KnowledgeBaseEntry(
             uuid=str(uuid.uuid4()),
@@ -403,15 +902,8 @@ class ExcelProcessor(BaseProcessor):
     
     def _extract_tags(self, content: str) -> List[str]:
         """Extrai tags do conteúdo"""
-        tags = []
-        
         # Palavras-chave comuns em sistemas
-        keywords = ['CICS', 'DB2', 'IMS', 'COBOL', 'JCL', 'VSAM', 'Mainframe', 'Batch', 'Online']
-        for keyword in keywords:
-            if keyword.lower() in content.lower():
-                tags.append(keyword.lower())
-        
-        return list(set(tags))
+        return list(_EXCEL_KEYWORDS.find(content, self._lowered))
 
 class PDFProcessor(BaseProcessor):
     """Processador para arquivos PDF"""
@@ -421,10 +913,25 @@ class PDFProcessor(BaseProcessor):
         entries = []
         
         try:
+            # PyMuPDF (engine C MuPDF) é bem mais rápido que pdfplumber/pdfminer
+            try:
+                import pymupdf
+            except ImportError:
+                try:
+                    import fitz as pymupdf  # PyMuPDF < 1.24
+                except ImportError:
+                    pymupdf = None
+            
+            if pymupdf is not None:
+                try:
+                    return self._process_with_pymupdf(pymupdf)
+                except Exception as e:
+                    logger.warning(f"PyMuPDF falhou, tentando pdfplumber: {str(e)}")
+            
             import PyPDF2
             from pdfplumber import PDF
             
-            # Tentar com pdfplumber primeiro (melhor para tabelas)
+            # Fallback: pdfplumber (melhor análise de layout para tabelas)
             try:
                 with PDF.open(self.file_path) as pdf:
                     all_text = []
@@ -441,49 +948,7 @@ class PDFProcessor(BaseProcessor):
                         if page_tables:
                             tables.extend(page_tables)
                     
-                    # Criar entrada principal
-                    content = "\n\n".join(all_text)
-                    
-                    # Criar chunks por página
-                    chunks = []
-                    for i, page_text in enumerate(all_text):
-                        chunk = DocumentChunk(
-                            chunk_id=f"page_{i}",
-                            document_id=self.metadata.checksum,
-                            content=page_text,
-                            content_type="text",
-                            chunk_index=i,
-                            total_chunks=len(all_text),
-                            metadata={"page": i+1},
-                            embedding_text=page_text
-                        )
-                        chunks.append(chunk)
-                    
-                    # Criar entrada principal
-                    entry = KnowledgeBaseEntry(
-                        uuid=str(uuid.uuid4()),
-                        title=f"[PDF] {self.file_name}",
-                        content=content,
-                        summary=content[:1000],
-                        category="Document",
-                        tags=self._extract_pdf_tags(content),
-                        confidence_score=0.9,
-                        source=self.file_name,
-                        document_type="pdf",
-                        metadata={
-                            "pages": len(pdf.pages),
-                            "has_tables": len(tables) > 0
-                        },
-                        chunks=chunks,
-                        created_by="auto_import"
-                    )
-                    entries.append(entry)
-                    
-                    # Criar entradas para tabelas
-                    for i, table in enumerate(tables):
-                        table_entry = self._create_table_entry(table, i)
-                        if table_entry:
-                            entries.append(table_entry)
+                    entries.extend(self._create_entries(all_text, tables, len(pdf.pages)))
             
             except Exception as e:
                 logger.warning(f"pdfplumber falhou, tentando PyPDF2: {str(e)}")
@@ -521,15 +986,82 @@ class PDFProcessor(BaseProcessor):
         
         return entries
     
+    def _process_with_pymupdf(self, pymupdf) -> List[KnowledgeBaseEntry]:
+        """Extrai texto e tabelas com PyMuPDF, página a página"""
+        all_text = []
+        tables = []
+        
+        with pymupdf.open(self.file_path) as doc:
+            page_count = doc.page_count
+            
+            for i, page in enumerate(doc):
+                # Extrair texto
+                text = page.get_text("text")
+                if text.strip():
+                    all_text.append(f"--- Página {i+1} ---\n{text}")
+                
+                # Extrair tabelas (PyMuPDF >= 1.23)
+                if hasattr(page, 'find_tables'):
+                    tables.extend(table.extract() for table in page.find_tables().tables)
+        
+        return self._create_entries(all_text, tables, page_count)
+    
+    def _create_entries(self, all_text: List[str], tables: List[List[List]], page_count: int) -> List[KnowledgeBaseEntry]:
+        """Cria a entrada principal (com chunks por página) e as entradas de tabelas"""
+        entries = []
+        
+        # Criar entrada principal
+        content = "\n\n".join(all_text)
+        
+        # Criar chunks por página
+        chunks = []
+        for i, page_text in enumerate(all_text):
+            chunk = DocumentChunk(
+                chunk_id=f"page_{i}",
+                document_id=self.metadata.checksum,
+                content=page_text,
+                content_type="text",
+                chunk_index=i,
+                total_chunks=len(all_text),
+                metadata={"page": i+1},
+                embedding_text=page_text
+            )
+            chunks.append(chunk)
+        
+        # Criar entrada principal
+        entry = KnowledgeBaseEntry(
+            uuid=str(uuid.uuid4()),
+            title=f"[PDF] {self.file_name}",
+            content=content,
+            summary=content[:1000],
+            category="Document",
+            tags=self._extract_pdf_tags(content),
+            confidence_score=0.9,
+            source=self.file_name,
+            document_type="pdf",
+            metadata={
+                "pages": page_count,
+                "has_tables": len(tables) > 0
+            },
+            chunks=chunks,
+            created_by="auto_import"
+        )
+        entries.append(entry)
+        
+        # Criar entradas para tabelas
+        for i, table in enumerate(tables):
+            table_entry = self._create_table_entry(table, i)
+            if table_entry:
+                entries.append(table_entry)
+        
+        return entries
+    
     def _extract_pdf_tags(self, content: str) -> List[str]:
         """Extrai tags do PDF"""
         tags = ["pdf", "documento"]
         
         # Adicionar tags baseadas em palavras-chave
-        keywords = ['manual', 'guide', 'tutorial', 'specification', 'documentation']
-        for keyword in keywords:
-            if keyword in content.lower():
-                tags.append(keyword)
+        tags.extend(_PDF_KEYWORDS.find(content, self._lowered))
         
         return list(set(tags))
     
@@ -539,9 +1071,9 @@ class PDFProcessor(BaseProcessor):
             return None
         
         # Converter tabela para texto
-        content = "Tabela extraída:\n"
-        for row in table:
-            content += " | ".join(str(cell) for cell in row if cell) + "\n"
+        lines = ["Tabela extraída:"]
+        lines.extend(" | ".join(str(cell) for cell in row if cell) for row in table)
+        content = "\n".join(lines) + "\n"
         
         return KnowledgeBaseEntry(
             uuid=str(uuid.uuid4()),
@@ -558,6 +1090,42 @@ class PDFProcessor(BaseProcessor):
             created_by="auto_import"
         )
 
+# Elementos WordprocessingML lidos direto do XML
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W_NS + 'p'
+_W_TBL = _W_NS + 'tbl'
+_W_R = _W_NS + 'r'
+_W_HYPERLINK = _W_NS + 'hyperlink'
+_W_T = _W_NS + 't'
+_W_BR = _W_NS + 'br'
+_W_TYPE = _W_NS + 'type'
+_W_RUN_CHARS = {
+    _W_NS + 'tab': '\t',
+    _W_NS + 'ptab': '\t',
+    _W_NS + 'cr': '\n',
+    _W_NS + 'noBreakHyphen': '-',
+}
+
+def _docx_paragraph_text(p) -> str:
+    """Texto de um <w:p>, com as mesmas regras de Paragraph.text do python-docx"""
+    parts = []
+    for child in p.iterchildren(_W_R, _W_HYPERLINK):
+        runs = child.iterchildren(_W_R) if child.tag == _W_HYPERLINK else (child,)
+        for run in runs:
+            for e in run.iterchildren(_W_T, _W_BR, *_W_RUN_CHARS):
+                if e.tag == _W_T:
+                    parts.append(e.text or '')
+                elif e.tag == _W_BR:
+                    # Quebras de página/coluna não geram texto
+                    if e.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                        parts.append('\n')
+                else:
+                    parts.append(_W_RUN_CHARS[e.tag])
+    return ''.join(parts)
+
+# Início de seção: linha começando com título (#, números ou MAIÚSCULAS)
+_SECTION_SPLIT_RE = re.compile(r'\n(?=[A-Z\d#]{3,})')
+
 class WordProcessor(BaseProcessor):
     """Processador para arquivos Word"""
     
@@ -567,18 +1135,24 @@ class WordProcessor(BaseProcessor):
         
         try:
             from docx import Document
+            from docx.table import Table
             
             doc = Document(self.file_path)
             
-            # Extrair texto dos parágrafos
+            # Percorrer o corpo uma vez no nível do lxml, sem criar wrappers Paragraph
             paragraphs = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text)
+            tables = []
+            for element in doc.element.body.iterchildren(_W_P, _W_TBL):
+                if element.tag == _W_P:
+                    text = _docx_paragraph_text(element)
+                    if text.strip():
+                        paragraphs.append(text)
+                else:
+                    tables.append(Table(element, doc))
             
             # Extrair texto das tabelas
             tables_text = []
-            for table in doc.tables:
+            for table in tables:
                 table_data = []
                 for row in table.rows:
                     row_data = [cell.text.strip() for cell in row.cells]
@@ -598,7 +1172,7 @@ class WordProcessor(BaseProcessor):
             # Extrair metadados do documento
             metadata = {
                 "paragraphs": len(paragraphs),
-                "tables": len(doc.tables),
+                "tables": len(tables),
                 "has_images": len(doc.inline_shapes) > 0
             }
             
@@ -629,7 +1203,7 @@ class WordProcessor(BaseProcessor):
         chunks = []
         
         # Dividir por títulos (assumindo que títulos começam com #, números ou são MAIÚSCULAS)
-        sections = re.split(r'\n(?=[A-Z\d#]{3,})', content)
+        sections = _SECTION_SPLIT_RE.split(content)
         
         for i, section in enumerate(sections):
             if section.strip():
@@ -652,20 +1226,19 @@ class WordProcessor(BaseProcessor):
         tags = ["word", "documento"]
         
         # Detectar tipo de documento baseado no conteúdo
-        doc_types = {
-            'manual': ['manual', 'instruções', 'instructions'],
-            'relatório': ['relatório', 'report', 'análise'],
-            'procedimento': ['procedimento', 'procedure', 'processo'],
-            'política': ['política', 'policy', 'norma']
-        }
-        
-        content_lower = content.lower()
-        for tag, keywords in doc_types.items():
-            if any(keyword in content_lower for keyword in keywords):
+        found = _WORD_KEYWORDS.find(content, self._lowered)
+        for tag, keywords in _WORD_DOC_TYPES.items():
+            if not found.isdisjoint(keywords):
                 tags.append(tag)
         
         return list(set(tags))
 
+# Parâmetros do OCR
+_OCR_MAX_SIDE = 2000
+# Idiomas do Tesseract (ex.: KB_OCR_LANG=por+eng); padrão 'eng', o mesmo do Tesseract
+_OCR_LANG = os.environ.get('KB_OCR_LANG') or 'eng'
+_OCR_CONFIG = '--oem 1 --psm 6'
+
 class ImageProcessor(BaseProcessor):
     """Processador para arquivos de imagem com OCR"""
     
@@ -679,15 +1252,25 @@ class ImageProcessor(BaseProcessor):
             
             # Abrir imagem
             img = Image.open(self.file_path)
+            img.load()
+            width, height, img_format = img.width, img.height, img.format
+            
+            # O tempo do Tesseract cresce com o número de pixels: reduzir imagens grandes
+            if max(img.size) > _OCR_MAX_SIDE:
+                img.thumbnail((_OCR_MAX_SIDE, _OCR_MAX_SIDE), Image.LANCZOS)
             
-            # Fazer OCR
-            text = pytesseract.image_to_string(img)
+            # Fazer OCR (engine LSTM, bloco uniforme de texto)
+            try:
+                text = pytesseract.image_to_string(img, lang=_OCR_LANG, config=_OCR_CONFIG)
+            except pytesseract.TesseractError:
+                # Idiomas ou modelo LSTM não instalados: usar os padrões do Tesseract
+                text = pytesseract.image_to_string(img)
             
             # Metadados da imagem
             metadata = {
-                "width": img.width,
-                "height": img.height,
-                "format": img.format,
+                "width": width,
+                "height": height,
+                "format": img_format,
                 "mode": img.mode,
                 "has_text": len(text.strip()) > 0
             }
@@ -716,10 +1299,10 @@ class ImageProcessor(BaseProcessor):
             img_entry = KnowledgeBaseEntry(
                 uuid=str(uuid.uuid4()),
                 title=f"[Imagem] {self.file_name}",
-                content=f"Imagem: {self.file_name}\nDimensões: {img.width}x{img.height}\nFormato: {img.format}",
-                summary=f"Arquivo de imagem {img.format} ({img.width}x{img.height})",
+                content=f"Imagem: {self.file_name}\nDimensões: {width}x{height}\nFormato: {img_format}",
+                summary=f"Arquivo de imagem {img_format} ({width}x{height})",
                 category="Image",
-                tags=["imagem", img.format.lower() if img.format else "unknown"],
+                tags=["imagem", img_format.lower() if img_format else "unknown"],
                 confidence_score=1.0,
                 source=self.file_name,
                 document_type="image",
@@ -734,6 +1317,49 @@ class ImageProcessor(BaseProcessor):
         
         return entries
 
+# Amostra usada para detectar o encoding de arquivos que não são UTF-8
+_ENCODING_SAMPLE_BYTES = 1 << 20
+
+# Candidatos para a detecção; amostras curtas confundem o detector com code pages exóticas
+_ENCODING_CANDIDATES = ['utf_16', 'cp1252', 'latin_1', 'iso8859_15', 'cp850']
+
+def _detect_encoding(sample: bytes) -> Optional[str]:
+    """Detecta o encoding com charset-normalizer, se instalado"""
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return None
+    
+    best = from_bytes(sample, cp_isolation=_ENCODING_CANDIDATES).best()
+    return best.encoding if best else None
+
+# Padrões usados na detecção do tipo de conteúdo
+_MARKDOWN_PATTERNS = ('# ', '## ', '```')
+_CODE_PATTERNS = ('import ', 'function ', 'class ', 'def ', 'SELECT ', 'CREATE TABLE')
+
+# A partir deste tamanho o texto é lido em streaming, chunk a chunk
+_STREAMING_MIN_BYTES = 64 << 20
+
+def _bucketize(lengths: List[int], chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Agrupa parágrafos consecutivos em chunks de até chunk_size caracteres.
+    Recebe apenas os comprimentos e devolve intervalos (início, fim) de índices.
+    """
+    bounds = []
+    start = 0
+    size = 0
+    for i, length in enumerate(lengths):
+        if size + length < chunk_size:
+            size += length + 2  # separador '\n\n'
+        else:
+            if i > start:
+                bounds.append((start, i))
+            start = i
+            size = length + 2
+    if lengths:
+        bounds.append((start, len(lengths)))
+    return bounds
+
 class TextProcessor(BaseProcessor):
     """Processador para arquivos de texto"""
     
@@ -742,23 +1368,12 @@ class TextProcessor(BaseProcessor):
         entries = []
         
         try:
-            # Detectar encoding
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            content = None
+            # Arquivos muito grandes: chunks gerados em streaming (ver _process_large_text)
+            if self.metadata.file_size >= _STREAMING_MIN_BYTES:
+                entries.append(self._process_large_text())
+                return entries
             
-            for encoding in encodings:
-                try:
-                    with open(self.file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    self.metadata.encoding = encoding
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if content is None:
-                # Fallback: ler como binário
-                with open(self.file_path, 'rb') as f:
-                    content = f.read().decode('utf-8', errors='ignore')
+            content = self._read_text()
             
             # Detectar tipo de conteúdo
             content_type = self._detect_content_type(content)
@@ -775,6 +1390,9 @@ class TextProcessor(BaseProcessor):
                 "encoding": self.metadata.encoding,
                 "content_type": content_type
             }
+            language = DocumentTypeDetector.detect_with_language(self.file_path)[1]
+            if language:
+                metadata["language"] = language
             
             # Criar entrada
             entry = KnowledgeBaseEntry(
@@ -798,6 +1416,136 @@ class TextProcessor(BaseProcessor):
         
         return entries
     
+    def _iter_text_chunks(self, encoding: str, chunk_size: int = 5000):
+        """Lê o arquivo linha a linha e gera textos de ~chunk_size caracteres"""
+        buffer = []
+        buffer_size = 0
+        with open(self.file_path, 'r', encoding=encoding, errors='replace') as f:
+            for line in f:
+                buffer.append(line)
+                buffer_size += len(line)
+                if buffer_size >= chunk_size:
+                    yield ''.join(buffer)
+                    buffer = []
+                    buffer_size = 0
+        if buffer:
+            yield ''.join(buffer)
+    
+    def _process_large_text(self, chunk_size: int = 5000) -> KnowledgeBaseEntry:
+        """
+        Processa arquivo grande em streaming: tags e contagens são feitas chunk a chunk,
+        sem o split em parágrafos nem a cópia em minúsculas do arquivo inteiro; o conteúdo
+        completo é montado uma única vez a partir dos chunks
+        """
+        encoding = self._sniff_encoding()
+        self.metadata.encoding = encoding
+        
+        texts = []
+        tags = set()
+        for text in self._iter_text_chunks(encoding, chunk_size):
+            texts.append(text)
+            # Palavras-chave nunca atravessam linhas, e os chunks terminam em fim de linha
+            tags |= _MAINFRAME_KEYWORDS.find(text)
+        
+        content = ''.join(texts)
+        content_type = self._detect_content_type(content)
+        tags.add(content_type.lower())
+        
+        total_chunks = len(texts)
+        chunks = [
+            DocumentChunk(
+                chunk_id=f"chunk_{chunk_index}",
+                document_id=self.metadata.checksum,
+                content=text,
+                content_type="text",
+                chunk_index=chunk_index,
+                total_chunks=total_chunks,
+                metadata={"size": len(text)},
+                embedding_text=text
+            )
+            for chunk_index, text in enumerate(texts)
+        ]
+        
+        metadata = {
+            "lines": content.count('\n') + 1,
+            "characters": len(content),
+            "encoding": encoding,
+            "content_type": content_type,
+            "streamed": True
+        }
+        language = DocumentTypeDetector.detect_with_language(self.file_path)[1]
+        if language:
+            metadata["language"] = language
+        
+        return KnowledgeBaseEntry(
+            uuid=str(uuid.uuid4()),
+            title=f"[{content_type}] {self.file_name}",
+            content=content,
+            summary=content[:1000],
+            category=content_type,
+            tags=list(tags),
+            confidence_score=0.95,
+            source=self.file_name,
+            document_type="text",
+            metadata=metadata,
+            chunks=chunks,
+            created_by="auto_import"
+        )
+    
+    def _sniff_encoding(self) -> str:
+        """Detecta o encoding a partir do início do arquivo"""
+        with open(self.file_path, 'rb') as f:
+            sample = f.read(_ENCODING_SAMPLE_BYTES)
+        
+        try:
+            # Decoder incremental: um caractere multibyte cortado no fim da amostra não é erro
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return _detect_encoding(sample) or 'latin-1'
+    
+    def _read_text(self) -> str:
+        """
+        Lê o arquivo via mmap e decodifica direto das páginas mapeadas. O arquivo inteiro
+        vira uma única str (o conteúdo da entrada precisa dele completo); evita-se apenas a
+        cópia intermediária em bytes de f.read(). Arquivos grandes: ver _process_large_text.
+        """
+        if self.metadata.file_size == 0:
+            self.metadata.encoding = 'utf-8'
+            return ""
+        
+        content = None
+        
+        with open(self.file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            
+            # Caminho rápido: a grande maioria dos arquivos é UTF-8
+            try:
+                content = str(mm, 'utf-8')
+                self.metadata.encoding = 'utf-8'
+            except UnicodeDecodeError:
+                # Detectar encoding uma vez em vez de tentar decodificar várias vezes
+                detected = _detect_encoding(mm[:_ENCODING_SAMPLE_BYTES])
+                encodings = ([detected] if detected else []) + ['latin-1', 'cp1252', 'iso-8859-1']
+                for encoding in encodings:
+                    try:
+                        content = str(mm, encoding)
+                        self.metadata.encoding = encoding
+                        break
+                    except (UnicodeDecodeError, LookupError):
+                        continue
+            
+            if content is None:
+                # Fallback: ignorar bytes inválidos
+                content = str(mm, 'utf-8', 'ignore')
+        
+        # Normalizar quebras de linha como no modo texto
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
     def _detect_content_type(self, content: str) -> str:
         """Detecta o tipo de conteúdo do texto"""
         # Verificar se é JSON
@@ -810,7 +1558,7 @@ class TextProcessor(BaseProcessor):
         
         # Verificar se é XML/HTML
         if content.strip().startswith('<'):
-            if '<html' in content.lower():
+            if '<html' in self._lowered(content):
                 return "HTML"
             return "XML"
         
@@ -819,19 +1567,18 @@ class TextProcessor(BaseProcessor):
             return "YAML"
         
         # Verificar se é Markdown
-        if any(pattern in content for pattern in ['# ', '## ', '```']):
+        if any(pattern in content for pattern in _MARKDOWN_PATTERNS):
             return "Markdown"
         # Verificar links do markdown
         if '[](' in content or '![](' in content:
             return "Markdown"
         
         # Verificar se é código
-        code_patterns = ['import ', 'function ', 'class ', 'def ', 'SELECT ', 'CREATE TABLE']
-        if any(pattern in content for pattern in code_patterns):
+        if any(pattern in content for pattern in _CODE_PATTERNS):
             return "Code"
         
         # Verificar se é log
-        if any(word in content.lower()[:1000] for word in ['error', 'warning', 'info', 'debug', 'trace']):
+        if _LOG_KEYWORDS.find(content[:1000]):
             return "Log"
         
         return "Text"
@@ -843,44 +1590,23 @@ class TextProcessor(BaseProcessor):
         # Dividir por parágrafos primeiro
         paragraphs = content.split('\n\n')
         
-        current_chunk = ""
-        chunk_index = 0
-        
-        for para in paragraphs:
-            if len(current_chunk) + len(para) < chunk_size:
-                current_chunk += para + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(DocumentChunk(
-                        chunk_id=f"chunk_{chunk_index}",
-                        document_id=self.metadata.checksum,
-                        content=current_chunk,
-                        content_type="text",
-                        chunk_index=chunk_index,
-                        total_chunks=0,  # Será atualizado depois
-                        metadata={"size": len(current_chunk)},
-                        embedding_text=current_chunk
-                    ))
-                    chunk_index += 1
-                current_chunk = para + "\n\n"
-        
-        # Adicionar último chunk
-        if current_chunk:
+        # Limites dos chunks calculados só sobre os comprimentos; strings montadas uma vez por chunk
+        bounds = _bucketize(list(map(len, paragraphs)), chunk_size)
+        total_chunks = len(bounds)
+        
+        for chunk_index, (start, end) in enumerate(bounds):
+            current_chunk = "\n\n".join(paragraphs[start:end]) + "\n\n"
             chunks.append(DocumentChunk(
                 chunk_id=f"chunk_{chunk_index}",
                 document_id=self.metadata.checksum,
                 content=current_chunk,
                 content_type="text",
                 chunk_index=chunk_index,
-                total_chunks=len(chunks) + 1,
+                total_chunks=total_chunks,
                 metadata={"size": len(current_chunk)},
                 embedding_text=current_chunk
             ))
         
-        # Atualizar total_chunks
-        for chunk in chunks:
-            chunk.total_chunks = len(chunks)
-        
         return chunks
     
     def _extract_text_tags(self, content: str, content_type: str) -> List[str]:
@@ -888,15 +1614,7 @@ class TextProcessor(BaseProcessor):
         tags = [content_type.lower()]
         
         # Adicionar tags baseadas em palavras-chave específicas do domínio
-        mainframe_keywords = [
-            'mainframe', 'cobol', 'jcl', 'cics', 'db2', 'ims', 'vsam',
-            'rexx', 'racf', 'tso', 'ispf', 'sdsf', 'sort', 'idcams'
-        ]
-        
-        content_lower = content.lower()
-        for keyword in mainframe_keywords:
-            if keyword in content_lower:
-                tags.append(keyword)
+        tags.extend(_MAINFRAME_KEYWORDS.find(content, self._lowered))
         
         return list(set(tags))
 
@@ -904,123 +1622,323 @@ class TextProcessor(BaseProcessor):
 # PROCESSADOR UNIVERSAL
 # ================================================================================
 
+def _iter_files(root: str, recursive: bool = True):
+    """
+    Lista arquivos com os.scandir: o tipo de cada entrada vem da própria leitura
+    do diretório, sem um stat() por arquivo como Path.glob + is_file().
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.warning(f"Não foi possível listar {e.filename}: {e.strerror}")
+
+# Processador de cada tipo de documento
+_PROCESSORS = {
+    DocumentType.EXCEL: ExcelProcessor,
+    DocumentType.PDF: PDFProcessor,
+    DocumentType.WORD: WordProcessor,
+    DocumentType.IMAGE: ImageProcessor,
+    DocumentType.TEXT: TextProcessor,
+    # Adicionar mais processadores conforme necessário
+}
+
+# Instâncias reutilizadas por thread: process_file rebinda e limpa o estado da instância,
+# então duas threads nunca podem compartilhar a mesma
+_PROCESSOR_INSTANCES = threading.local()
+
+def _processor_instance(processor_class: type) -> BaseProcessor:
+    """Uma instância de cada processador por thread, reutilizada entre arquivos"""
+    instances = _PROCESSOR_INSTANCES.__dict__.setdefault('by_class', {})
+    processor = instances.get(processor_class)
+    if processor is None:
+        processor = instances[processor_class] = processor_class()
+    return processor
+
+def process_file(file_path: str, processors: Optional[Dict[DocumentType, type]] = None,
+                 doc_type: Optional[DocumentType] = None) -> List[KnowledgeBaseEntry]:
+    """Processa um único arquivo (nível de módulo para ser usado em pools de processos)"""
+    logger.info(f"Processando: {file_path}")
+    
+    # Detectar tipo de documento (pelo conteúdo quando a extensão é desconhecida)
+    if doc_type is None:
+        doc_type = DocumentTypeDetector.detect_from_file(file_path)
+    logger.info(f"Tipo detectado: {doc_type.value}")
+    
+    # Selecionar processador apropriado
+    processor_class = (processors or _PROCESSORS).get(doc_type)
+    
+    if not processor_class:
+        # Fallback para processador de texto
+        logger.warning(f"Processador não encontrado para {doc_type.value}, usando TextProcessor")
+        processor_class = TextProcessor
+    
+    # Processar documento
+    try:
+        entries = _processor_instance(processor_class).process_file(file_path)
+        logger.info(f"Extraídas {len(entries)} entradas de {file_path}")
+        return entries
+    except Exception as e:
+        logger.error(f"Erro ao processar {file_path}: {str(e)}")
+        return []
+
+def _json_default(obj):
+    """Tipos sem representação JSON nativa; datas em ISO 8601 como o orjson"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return str(obj)
+
+@functools.lru_cache(maxsize=1)
+def _json_dumps():
+    """Serializador JSON para bytes: orjson se instalado, senão json da stdlib"""
+    try:
+        import orjson
+    except ImportError:
+        # Mesma saída compacta do orjson
+        return lambda obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                                      default=_json_default).encode('utf-8')
+    
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    return lambda obj: orjson.dumps(obj, default=_json_default, option=options)
+
+# COPY para uma tabela temporária e upsert a partir dela (COPY sozinho não faz ON CONFLICT)
+_SQL_COPY_HEADER = """CREATE TEMP TABLE kb_import (
+    uuid UUID, title TEXT, content TEXT, summary TEXT, category TEXT, tags TEXT[],
+    confidence_score NUMERIC, source TEXT, metadata JSONB, created_by TEXT
+) ON COMMIT DROP;
+
+COPY kb_import (
+    uuid, title, content, summary, category, tags,
+    confidence_score, source, metadata, created_by
+) FROM STDIN;
+"""
+
+_SQL_COPY_FOOTER = """\\.
+
+INSERT INTO knowledge_base (
+    uuid, title, content, summary, category, tags,
+    confidence_score, source, metadata, created_by, created_at
+)
+SELECT
+    uuid, title, content, summary, category, tags,
+    confidence_score, source, metadata, created_by, CURRENT_TIMESTAMP
+FROM kb_import
+ON CONFLICT (uuid) DO UPDATE SET
+    content = EXCLUDED.content,
+    updated_at = CURRENT_TIMESTAMP;
+
+COMMIT;
+"""
+
+# Tamanho dos blocos gravados pelo gerador de SQL
+_SQL_WRITE_CHUNK = 1 << 20
+
+# Escapes do formato texto do COPY, aplicados em uma única passada por str.translate
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\x00': None})
+
+def _pg_array(values: List[str]) -> str:
+    """Literal de array do PostgreSQL com cada elemento entre aspas"""
+    return "{" + ",".join('"' + v.replace('\\', '\\\\').replace('"', '\\"') + '"' for v in values) + "}"
+
+def _copy_row(entry: KnowledgeBaseEntry) -> str:
+    """Linha do COPY (colunas separadas por tab) para uma entrada"""
+    fields = (
+        entry.uuid, entry.title, entry.content, entry.summary, entry.category,
+        _pg_array(entry.tags), str(entry.confidence_score), entry.source,
+        json.dumps(entry.metadata, ensure_ascii=False, default=str), entry.created_by
+    )
+    return "\t".join(field.translate(_COPY_ESCAPES) for field in fields) + "\n"
+
+# Template do script de importação com embeddings (ver generate_import_script)
+_IMPORT_TEMPLATE_PATH = Path(__file__).with_name("import_template.py")
+
 class UniversalDocumentProcessor:
     """
     Processador universal que gerencia todos os tipos de documentos
     """
     
-    def __init__(self, output_dir: str = "./kb_output"):
+    def __init__(self, output_dir: str = "./kb_output", checksum_cache: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.processors = {
-            DocumentType.EXCEL: ExcelProcessor,
-            DocumentType.PDF: PDFProcessor,
-            DocumentType.WORD: WordProcessor,
-            DocumentType.IMAGE: ImageProcessor,
-            DocumentType.TEXT: TextProcessor,
-            # Adicionar mais processadores conforme necessário
-        }
+        # Cache de checksums entre execuções: em output_dir se pedido, senão KB_CHECKSUM_CACHE
+        self._checksum_cache_path = (
+            str(self.output_dir / ".checksums.sqlite") if checksum_cache else _CHECKSUM_CACHE_ENV
+        )
+        self.processors = dict(_PROCESSORS)
+        self._type_cache_path = self.output_dir / ".type_cache.json"
+        self._type_cache = self._load_type_cache()
+        self._type_cache_dirty = False
+    
+    def _load_type_cache(self) -> Dict[str, List]:
+        """
+        Carrega o cache de tipos detectados por conteúdo de execuções anteriores,
+        no formato {caminho: [mtime_ns, tamanho, tipo]}. Arquivo ausente, corrompido
+        ou em formato inesperado vale como cache vazio.
+        """
+        try:
+            with open(self._type_cache_path, 'rb') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except Exception:
+            pass
+        return {}
+    
+    def _save_type_cache(self):
+        """Persiste o cache de tipos, se houve alterações"""
+        if not self._type_cache_dirty:
+            return
+        try:
+            with open(self._type_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._type_cache, f, ensure_ascii=False)
+            self._type_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o cache de tipos: {e}")
+    
+    def detect_type(self, file_path: str) -> DocumentType:
+        """Detecta o tipo de um único arquivo (ver detect_types)"""
+        return self.detect_types([file_path])[0]
+    
+    def detect_types(self, file_paths: List[str]) -> List[DocumentType]:
+        """
+        Detecta o tipo de cada arquivo. Pela extensão não há custo; a detecção por
+        conteúdo fica em cache por (caminho, mtime, tamanho) entre execuções, e os
+        arquivos que as assinaturas não identificam vão ao Magika em um único lote.
+        """
+        doc_types = []
+        ambiguous = []  # (posição, caminho, [mtime_ns, tamanho])
+        for i, file_path in enumerate(file_paths):
+            doc_type = DocumentTypeDetector.detect(file_path)
+            doc_types.append(doc_type)
+            if doc_type is not DocumentType.UNKNOWN:
+                continue
+            
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            
+            stamp = [st.st_mtime_ns, st.st_size]
+            cached = self._type_cache.get(file_path)
+            if isinstance(cached, list) and cached[:2] == stamp:
+                try:
+                    doc_types[i] = DocumentType(cached[2])
+                    continue
+                except (IndexError, ValueError):
+                    pass  # tipo que não existe mais no enum: detectar de novo
+            
+            doc_type = DocumentTypeDetector.detect_from_file(file_path, use_model=False)
+            if doc_type is DocumentType.UNKNOWN:
+                ambiguous.append((i, file_path, stamp))
+                continue
+            doc_types[i] = doc_type
+            self._type_cache[file_path] = stamp + [doc_type.value]
+            self._type_cache_dirty = True
+        
+        if ambiguous:
+            detected = DocumentTypeDetector.detect_from_model([path for _, path, _ in ambiguous])
+            # Sem o Magika instalado o resultado não é definitivo: não vai para o cache
+            cacheable = _magika() is not None
+            for (i, file_path, stamp), doc_type in zip(ambiguous, detected):
+                doc_types[i] = doc_type
+                if cacheable:
+                    self._type_cache[file_path] = stamp + [doc_type.value]
+                    self._type_cache_dirty = True
+        
+        return doc_types
     
     def process_file(self, file_path: str) -> List[KnowledgeBaseEntry]:
         """Processa um único arquivo"""
-        logger.info(f"Processando: {file_path}")
-        
-        # Detectar tipo de documento
-        doc_type = DocumentTypeDetector.detect(file_path)
-        logger.info(f"Tipo detectado: {doc_type.value}")
-        
-        # Selecionar processador apropriado
-        processor_class = self.processors.get(doc_type)
-        
-        if not processor_class:
-            # Fallback para processador de texto
-            logger.warning(f"Processador não encontrado para {doc_type.value}, usando TextProcessor")
-            processor_class = TextProcessor
-        
-        # Processar documento
-        try:
-            processor = processor_class(file_path)
-            entries = processor.process()
-            logger.info(f"Extraídas {len(entries)} entradas de {file_path}")
-            return entries
-        except Exception as e:
-            logger.error(f"Erro ao processar {file_path}: {str(e)}")
-            return []
+        with _checksum_cache_scope(self._checksum_cache_path):
+            entries = process_file(file_path, self.processors, self.detect_type(file_path))
+        self._save_type_cache()
+        return entries
     
-    def process_directory(self, directory: str, recursive: bool = True) -> List[KnowledgeBaseEntry]:
-        """Processa todos os arquivos em um diretório"""
-        all_entries = []
-        path = Path(directory)
+    def process_files(self, file_paths: List[str], max_workers: Optional[int] = None) -> List[KnowledgeBaseEntry]:
+        """Processa vários arquivos em paralelo, um arquivo por tarefa do pool de processos"""
+        file_paths = list(file_paths)
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
         
-        # Padrão de busca
-        pattern = "**/*" if recursive else "*"
+        # Tipos detectados no processo principal, onde fica o cache
+        doc_types = self.detect_types(file_paths)
+        self._save_type_cache()
         
-        for file_path in path.glob(pattern):
-            if file_path.is_file():
-                entries = self.process_file(str(file_path))
-                all_entries.extend(entries)
+        all_entries = []
         
+        with _checksum_cache_scope(self._checksum_cache_path):
+            # Um único arquivo/worker, ou já dentro de um worker: processar em série
+            if workers <= 1 or multiprocessing.parent_process() is not None:
+                for file_path, doc_type in zip(file_paths, doc_types):
+                    all_entries.extend(process_file(file_path, self.processors, doc_type))
+                return all_entries
+            
+            # Cada worker abre o cache de checksums configurado para esta execução
+            with ProcessPoolExecutor(max_workers=workers, initializer=_set_checksum_cache,
+                                     initargs=(self._checksum_cache_path,)) as executor:
+                # chunksize amortiza o custo de IPC entre arquivos pequenos
+                for entries in executor.map(process_file, file_paths, repeat(self.processors), doc_types, chunksize=4):
+                    all_entries.extend(entries)
         return all_entries
     
+    def process_directory(self, directory: str, recursive: bool = True,
+                          max_workers: Optional[int] = None) -> List[KnowledgeBaseEntry]:
+        """Processa todos os arquivos em um diretório, em paralelo entre arquivos"""
+        # Listar primeiro, depois distribuir os arquivos entre processos
+        file_paths = list(_iter_files(directory, recursive))
+        
+        return self.process_files(file_paths, max_workers)
+    
     def save_to_json(self, entries: List[KnowledgeBaseEntry], output_file: str = None):
         """Salva entradas em formato JSON"""
         if not output_file:
             output_file = self.output_dir / "kb_entries.json"
         
-        # Converter para dict
-        entries_dict = []
-        for entry in entries:
-            entry_dict = asdict(entry)
-            # Converter chunks também
-            entry_dict['chunks'] = [asdict(chunk) for chunk in entry.chunks]
-            entries_dict.append(entry_dict)
-        
-        # Salvar JSON
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(entries_dict, f, ensure_ascii=False, indent=2, default=str)
+        # Salvar JSON em streaming: um elemento do array por vez
+        dumps = _json_dumps()
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.write(b"[")
+            for i, entry in enumerate(entries):
+                f.write(b",\n" if i else b"\n")
+                f.write(dumps(_entry_to_dict(entry)))
+            f.write(b"\n]\n" if entries else b"]\n")
         
         logger.info(f"Salvo {len(entries)} entradas em {output_file}")
     
     def generate_sql_script(self, entries: List[KnowledgeBaseEntry], output_file: str = None):
-        """Gera script SQL para inserção no PostgreSQL"""
+        """Gera script SQL (psql) para inserção no PostgreSQL via COPY"""
         if not output_file:
             output_file = self.output_dir / "insert_kb.sql"
         
-        sql_lines = [
+        header = "\n".join([
             "-- Script de inserção na Knowledge Base",
             f"-- Gerado em: {datetime.now().isoformat()}",
             f"-- Total de entradas: {len(entries)}",
+            f"-- Requer psql (COPY ... FROM STDIN): psql -v ON_ERROR_STOP=1 -f {Path(output_file).name}",
+            "-- Outros clientes SQL não leem os dados em linha do COPY",
             "",
             "BEGIN;",
-            ""
-        ]
-        
-        for entry in entries:
-            # Escapar aspas simples
-            title = entry.title.replace("'", "''")
-            content = entry.content.replace("'", "''")
-            summary = entry.summary.replace("'", "''")
-            tags = "{" + ",".join(entry.tags) + "}"
-            metadata = json.dumps(entry.metadata).replace("'", "''")
-            
-            sql = f"""
-INSERT INTO knowledge_base (
-    uuid, title, content, summary, category, tags,
-    confidence_score, source, metadata, created_by, created_at
-) VALUES (
-    '{entry.uuid}', '{title}', '{content}', '{summary}',
-    '{entry.category}', '{tags}', {entry.confidence_score},
-    '{entry.source}', '{metadata}'::jsonb, '{entry.created_by}', CURRENT_TIMESTAMP
-) ON CONFLICT (uuid) DO UPDATE SET
-    content = EXCLUDED.content,
-    updated_at = CURRENT_TIMESTAMP;
-"""
-            sql_lines.append(sql)
-        
-        sql_lines.extend(["", "COMMIT;", ""])
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("\n".join(sql_lines))
+            "",
+            _SQL_COPY_HEADER
+        ])
+        
+        # Linhas do COPY acumuladas em um bytearray e gravadas em blocos de ~1 MB,
+        # sem manter o script inteiro em memória
+        buf = bytearray(header.encode('utf-8'))
+        with open(output_file, 'wb') as f:
+            for entry in entries:
+                buf += _copy_row(entry).encode('utf-8')
+                if len(buf) >= _SQL_WRITE_CHUNK:
+                    f.write(buf)
+                    buf.clear()
+            buf += _SQL_COPY_FOOTER.encode('utf-8')
+            f.write(buf)
         
         logger.info(f"Script SQL gerado: {output_file}")
     
@@ -1029,85 +1947,12 @@ INSERT INTO knowledge_base (
         if not output_file:
             output_file = self.output_dir / "import_with_embeddings.py"
         
-        script = f'''#!/usr/bin/env python3
-"""
-Script de importação com geração de embeddings
-"""
-
-import json
-import psycopg2
-from openai import OpenAI
-import time
-
-# Configuração
-DB_CONFIG = {{
-    "host": "localhost",
-    "port": 5432,
-    "database": "mainframe_ai",
-    "user": "mainframe_user",
-    "password": "mainframe_pass"
-}}
-
-# Dados a importar
-entries = {json.dumps([asdict(e) for e in entries[:5]], indent=2)}  # Amostra de 5 entradas
-
-# Cliente OpenAI
-openai_client = OpenAI()
-
-def generate_embedding(text):
-    """Gera embedding usando OpenAI"""
-    try:
-        response = openai_client.embeddings.create(
-            model="text-embedding-ada-002",
-            input=text[:8000]  # Limitar tamanho
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"Erro ao gerar embedding: {{e}}")
-        return None
-
-def import_entries():
-    """Importa entradas com embeddings"""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-    
-    for entry in entries:
-        print(f"Processando: {{entry['title']}}")
-        
-        # Gerar embedding
-        embedding = generate_embedding(entry['content'])
-        
-        if embedding:
-            # Inserir no banco
-            cur.execute("""
-                INSERT INTO knowledge_base (
-                    uuid, title, content, summary, category, tags,
-                    confidence_score, source, embedding, metadata,
-                    created_by, created_at
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
-                ) ON CONFLICT (uuid) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                entry['uuid'], entry['title'], entry['content'],
-                entry['summary'], entry['category'], entry['tags'],
-                entry['confidence_score'], entry['source'],
-                json.dumps(embedding), json.dumps(entry['metadata']),
-                entry['created_by']
-            ))
+        # Dados em um JSON ao lado do script; o código vem de um template estático
+        entries_file = Path(output_file).with_name("import_entries.json")
+        self.save_to_json(entries[:5], entries_file)  # Amostra de 5 entradas
         
-        time.sleep(0.1)  # Rate limiting
-    
-    conn.commit()
-    cur.close()
-    conn.close()
-    print("Importação concluída!")
-
-if __name__ == "__main__":
-    import_entries()
-'''
+        script = _IMPORT_TEMPLATE_PATH.read_text(encoding='utf-8')
+        script = script.replace('"__ENTRIES_PATH__"', repr(str(entries_file.absolute())))
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(script)
@@ -1126,14 +1971,18 @@ def main():
     parser.add_argument("input", help="Arquivo ou diretório para processar")
     parser.add_argument("-o", "--output", default="./kb_output", help="Diretório de saída")
     parser.add_argument("-r", "--recursive", action="store_true", help="Processar diretórios recursivamente")
-    parser.add_argument("--sql", action="store_true", help="Gerar script SQL")
+    parser.add_argument("--sql", action="store_true", help="Gerar script SQL para psql (usa COPY FROM STDIN)")
     parser.add_argument("--json", action="store_true", help="Gerar arquivo JSON")
     parser.add_argument("--import-script", action="store_true", help="Gerar script de importação")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Processos para diretórios (padrão: número de CPUs)")
+    parser.add_argument("--checksum-cache", action="store_true",
+                        help="Guardar checksums em cache no diretório de saída entre execuções")
     
     args = parser.parse_args()
     
     # Criar processador
-    processor = UniversalDocumentProcessor(args.output)
+    processor = UniversalDocumentProcessor(args.output, checksum_cache=args.checksum_cache)
     
     # Processar entrada
     input_path = Path(args.input)
@@ -1141,7 +1990,7 @@ def main():
     if input_path.is_file():
         entries = processor.process_file(str(input_path))
     elif input_path.is_dir():
-        entries = processor.process_directory(str(input_path), args.recursive)
+        entries = processor.process_directory(str(input_path), args.recursive, args.workers)
     else:
         logger.error(f"Caminho inválido: {args.input}")
         return
@@ -1153,19 +2002,15 @@ def main():
         logger.info(f"{'='*60}\n")
         
         # Estatísticas
-        categories = {}
-        doc_types = {}
-        
-        for entry in entries:
-            categories[entry.category] = categories.get(entry.category, 0) + 1
-            doc_types[entry.document_type] = doc_types.get(entry.document_type, 0) + 1
+        categories = Counter(entry.category for entry in entries)
+        doc_types = Counter(entry.document_type for entry in entries)
         
         logger.info("Distribuição por categoria:")
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+        for cat, count in categories.most_common():
             logger.info(f"  - {cat}: {count}")
         
         logger.info("\nDistribuição por tipo de documento:")
-        for dtype, count in sorted(doc_types.items(), key=lambda x: x[1], reverse=True):
+        for dtype, count in doc_types.most_common():
             logger.info(f"  - {dtype}: {count}")
         
         # Gerar saídas
@@ -8,43 +8,139 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import sqlite3
 import json
+import re
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import webbrowser
 
+from scripts.fts_schema import FTS_STATEMENTS
+
 class DatabaseManager:
+    # Columns shown in the list; the full row is loaded on selection by get_incident
+    LIST_COLUMNS = ('id', 'title', 'category', 'severity', 'status', 'created_at')
+    # Rows per list page; list methods return (rows, cursor) and take the cursor back as after
+    PAGE_SIZE = 100
+
     def __init__(self):
         self.db_path = 'kb-assistant.db'
 
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def search_incidents(self, query):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        # One connection for the lifetime of the app; autocommit, with explicit
+        # transactions where several statements must apply together
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+
+        # Serializes use of the shared connection across threads
+        self.lock = threading.Lock()
+
+        self.fts_enabled = self.ensure_search_index()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def ensure_search_index(self):
+        """Create the FTS5 index if missing; False when it can't be used (no entries table or no FTS5)"""
+        with self.lock:
+            try:
+                rows = self.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE name IN ('entries', 'entries_fts')"
+                ).fetchall()
+                existing = {row[0] for row in rows}
+                if 'entries' not in existing:
+                    return False
+                if 'entries_fts' not in existing:
+                    self.conn.execute("BEGIN IMMEDIATE")
+                    for statement in FTS_STATEMENTS:
+                        self.conn.execute(statement)
+                    self.conn.execute("COMMIT")
+                return True
+            except sqlite3.Error:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                return False
+
+    @staticmethod
+    def fts_query(query):
+        """Search text as an FTS5 expression: every word quoted, prefix-matched and ANDed"""
+        return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', query))
+
+    def _page(self, rows, key_columns):
+        """Split a PAGE_SIZE + 1 fetch into the page and the cursor where the next page starts"""
+        more = len(rows) > self.PAGE_SIZE
+        rows = rows[:self.PAGE_SIZE]
+        cursor = tuple(rows[-1][column] for column in key_columns) if more else None
+        return [{column: row[column] for column in self.LIST_COLUMNS} for row in rows], cursor
+
+    @staticmethod
+    def _created_keyset(after):
+        """WHERE clause continuing a created_at DESC, id listing after the (created_at, id) cursor"""
+        if after is None:
+            return '1', []
+        created_at, entry_id = after
+        # created_at <= ? lets SQLite seek into idx_entries_created instead of scanning from the top
+        return '(created_at <= ? AND (created_at < ? OR id > ?))', [created_at, created_at, entry_id]
+
+    def search_incidents(self, query, after=None):
+        fts_query = self.fts_query(query) if self.fts_enabled else ''
+        with self.lock:
+            if fts_query:
+                # Relevance order, continued by (rank, rowid) across pages
+                keyset, params = '', [fts_query]
+                if after is not None:
+                    keyset = 'AND (f.rank > ? OR (f.rank = ? AND f.rowid > ?))'
+                    params += [after[0], after[0], after[1]]
+                rows = self.conn.execute(f"""
+                    SELECT {', '.join('e.' + column for column in self.LIST_COLUMNS)},
+                           f.rank AS search_rank, f.rowid AS search_rowid
+                    FROM entries_fts f
+                    JOIN entries e ON e.rowid = f.rowid
+                    WHERE entries_fts MATCH ? {keyset}
+                    ORDER BY f.rank, f.rowid
+                    LIMIT ?
+                """, params + [self.PAGE_SIZE + 1]).fetchall()
+                return self._page(rows, ('search_rank', 'search_rowid'))
+
+            # Fallback without the index (or for queries with no words)
             search_term = f'%{query}%'
-            cursor.execute("""
-                SELECT * FROM entries
-                WHERE title LIKE ? OR description LIKE ?
-                   OR category LIKE ? OR solution LIKE ?
-                ORDER BY created_at DESC
-                LIMIT 100
-            """, (search_term, search_term, search_term, search_term))
-            return [dict(row) for row in cursor.fetchall()]
-
-    def get_all_incidents(self):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM entries ORDER BY created_at DESC LIMIT 100")
-            return [dict(row) for row in cursor.fetchall()]
+            keyset, params = self._created_keyset(after)
+            rows = self.conn.execute(f"""
+                SELECT {', '.join(self.LIST_COLUMNS)} FROM entries
+                WHERE (title LIKE ? OR description LIKE ?
+                       OR category LIKE ? OR solution LIKE ?)
+                  AND {keyset}
+                ORDER BY created_at DESC, id
+                LIMIT ?
+            """, [search_term] * 4 + params + [self.PAGE_SIZE + 1]).fetchall()
+            return self._page(rows, ('created_at', 'id'))
+
+    def get_incident(self, incident_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM entries WHERE id = ? LIMIT 1", (incident_id,)
+            ).fetchone()
+            return dict(row) if row else None
+
+    def get_all_incidents(self, after=None):
+        keyset, params = self._created_keyset(after)
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT {', '.join(self.LIST_COLUMNS)} FROM entries
+                WHERE {keyset}
+                ORDER BY created_at DESC, id
+                LIMIT ?
+            """, params + [self.PAGE_SIZE + 1]).fetchall()
+            return self._page(rows, ('created_at', 'id'))
 
     def add_incident(self, data):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self.lock:
+            cursor = self.conn.execute("""
                 INSERT INTO entries (
                     title, description, category, severity,
                     status, priority, reporter, created_at, updated_at
@@ -54,7 +150,6 @@ class DatabaseManager:
                 data['severity'], data.get('status', 'aberto'),
                 data.get('priority', 'P3'), data['reporter']
             ))
-            conn.commit()
             return cursor.lastrowid
 
 class MainframeAssistantApp:
@@ -66,6 +161,17 @@ class MainframeAssistantApp:
         # Database
         self.db = DatabaseManager()
 
+        # Rows currently shown in the list, keyed by tree item
+        self._loaded = {}
+
+        # Database calls run on a single worker thread; results come back to the
+        # Tk thread through after() polling. Only the latest list query is shown.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._list_seq = 0
+        self._list_future = None
+        # (func, args, cursor) continuing the current listing, if it has more rows
+        self._next_page = None
+
         # Accenture colors
         self.colors = {
             'purple': '#A100FF',
@@ -159,6 +265,16 @@ class MainframeAssistantApp:
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
         self.tree.configure(yscroll=scrollbar.set)
 
+        # Next page of the current listing
+        self.load_more_button = tk.Button(
+            list_frame,
+            text="⬇ Load More",
+            command=self.load_more_incidents,
+            state=tk.DISABLED,
+            font=('Arial', 10)
+        )
+        self.load_more_button.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -193,21 +309,69 @@ class MainframeAssistantApp:
         )
         self.status_label.pack(side=tk.LEFT, padx=10, pady=5)
 
-    def load_incidents(self):
-        """Load all incidents from database"""
-        self.tree.delete(*self.tree.get_children())
-        incidents = self.db.get_all_incidents()
+    def show_incidents(self, incidents, append=False):
+        """Replace (or extend) the list contents with the given incidents"""
+        if not append:
+            self.tree.delete(*self.tree.get_children())
+            self._loaded = {}
 
         for incident in incidents:
-            self.tree.insert('', tk.END, values=(
+            item = self.tree.insert('', tk.END, values=(
                 incident.get('id', ''),
                 incident.get('title', ''),
                 incident.get('category', ''),
                 incident.get('severity', ''),
                 incident.get('status', '')
             ))
+            self._loaded[item] = incident
+
+    def show_page(self, page, func, args, append=False):
+        """Show one page of a listing and remember where the next one starts"""
+        incidents, cursor = page
+        self.show_incidents(incidents, append)
+        if cursor is not None:
+            self._next_page = (func, args, cursor)
+            self.load_more_button.config(state=tk.NORMAL)
+
+    def run_in_background(self, func, args, on_done, seq=None):
+        """Run a database call on the worker thread and hand its result to on_done on the Tk thread"""
+        future = self.executor.submit(func, *args)
+        self.root.after(50, self._poll_future, future, on_done, seq)
+        return future
+
+    def _poll_future(self, future, on_done, seq):
+        if not future.done():
+            self.root.after(50, self._poll_future, future, on_done, seq)
+            return
+
+        # Superseded list query (or cancelled before it ran): drop the result
+        if future.cancelled() or (seq is not None and seq != self._list_seq):
+            return
 
-        self.status_label.config(text=f"Loaded {len(incidents)} incidents")
+        try:
+            result = future.result()
+        except Exception as e:
+            self.status_label.config(text=f"Database error: {e}")
+            return
+        on_done(result)
+
+    def query_list(self, func, args, on_done):
+        """Start a list query, superseding any list query still pending"""
+        if self._list_future is not None:
+            self._list_future.cancel()
+        self._list_seq += 1
+        self._next_page = None
+        self.load_more_button.config(state=tk.DISABLED)
+        self._list_future = self.run_in_background(func, args, on_done, self._list_seq)
+
+    def load_incidents(self):
+        """Load all incidents from database"""
+        def done(page):
+            self.show_page(page, self.db.get_all_incidents, ())
+            self.status_label.config(text=f"Loaded {len(self._loaded)} incidents")
+
+        self.status_label.config(text="Loading...")
+        self.query_list(self.db.get_all_incidents, (), done)
 
     def search_incidents(self):
         """Search incidents"""
@@ -216,19 +380,25 @@ class MainframeAssistantApp:
             self.load_incidents()
             return
 
-        self.tree.delete(*self.tree.get_children())
-        incidents = self.db.search_incidents(query)
+        def done(page):
+            self.show_page(page, self.db.search_incidents, (query,))
+            self.status_label.config(text=f"Found {len(self._loaded)} incidents matching '{query}'")
 
-        for incident in incidents:
-            self.tree.insert('', tk.END, values=(
-                incident.get('id', ''),
-                incident.get('title', ''),
-                incident.get('category', ''),
-                incident.get('severity', ''),
-                incident.get('status', '')
-            ))
+        self.status_label.config(text=f"Searching '{query}'...")
+        self.query_list(self.db.search_incidents, (query,), done)
+
+    def load_more_incidents(self):
+        """Append the next page of the current listing"""
+        if self._next_page is None:
+            return
+        func, args, cursor = self._next_page
+
+        def done(page):
+            self.show_page(page, func, args, append=True)
+            self.status_label.config(text=f"Showing {len(self._loaded)} incidents")
 
-        self.status_label.config(text=f"Found {len(incidents)} incidents matching '{query}'")
+        self.status_label.config(text="Loading more...")
+        self.query_list(func, args + (cursor,), done)
 
     def on_select_incident(self, event):
         """Show incident details when selected"""
@@ -236,13 +406,19 @@ class MainframeAssistantApp:
         if not selection:
             return
 
-        item = self.tree.item(selection[0])
-        incident_id = item['values'][0]
+        # The list only holds summary columns; fetch the full row for the details panel
+        item = selection[0]
+        incident_id = self._loaded[item]['id']
 
-        # Get full incident details
-        incidents = self.db.get_all_incidents()
-        incident = next((i for i in incidents if i.get('id') == incident_id), None)
+        def done(incident):
+            # Ignore the result if the selection moved on meanwhile
+            if self.tree.selection() == (item,):
+                self.show_details(incident)
 
+        self.run_in_background(self.db.get_incident, (incident_id,), done)
+
+    def show_details(self, incident):
+        """Fill the details panel"""
         if incident:
             self.details_text.delete(1.0, tk.END)
             details = f"""
@@ -312,10 +488,12 @@ Solution:
                 messagebox.showwarning("Incomplete", "Please fill all required fields")
                 return
 
-            self.db.add_incident(data)
-            self.load_incidents()
-            dialog.destroy()
-            messagebox.showinfo("Success", "Incident created successfully")
+            def saved(_):
+                self.load_incidents()
+                dialog.destroy()
+                messagebox.showinfo("Success", "Incident created successfully")
+
+            self.run_in_background(self.db.add_incident, (data,), saved)
 
         tk.Button(
             dialog,
@@ -329,6 +507,8 @@ def main():
     root = tk.Tk()
     app = MainframeAssistantApp(root)
     root.mainloop()
+    app.executor.shutdown(cancel_futures=True)
+    app.db.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file